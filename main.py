@@ -2,11 +2,35 @@
 """
 Main entry point for the Visual Manufacturing Procedures application.
 This file creates the main App controller that manages all frames.
+
+Frames are built the first time they are shown, and the editor's modules
+(Pillow, fpdf, requests) are only imported then, so the home page appears
+quickly. `python main.py --startup-time` prints how long startup took and
+exits; `--budget MS` makes it fail when startup is slower than that.
+Tools > Record Performance Trace (or VMP_TRACE=1) records timing spans that
+can be saved as a Chrome trace, see src/tracing.py.
 """
 
+import time
+
+STARTED_AT = time.perf_counter()
+
+import argparse
+import os
+import sys
 import tkinter as tk
 from src.home_page import HomePage
-from src.main_window import EditorPage
+from src import tracing
+
+def editor_page(parent, controller):
+    from src.main_window import EditorPage
+    return EditorPage(parent=parent, controller=controller)
+
+# Page name -> factory building the frame on first show
+FRAME_FACTORIES = {
+    "HomePage": HomePage,
+    "EditorPage": editor_page,
+}
 
 class App(tk.Tk):
     """Main application controller."""
@@ -16,32 +40,117 @@ class App(tk.Tk):
         self.title("Visual Manufacturing Procedures Tool")
         self.geometry("1280x720")
 
-        container = tk.Frame(self)
-        container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.container = tk.Frame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
-        for F in (HomePage, EditorPage):
-            page_name = F.__name__
-            frame = F(parent=container, controller=self)
+        self.current_frame = None
+        self.setup_menu()
+        self.show_frame("HomePage")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def get_frame(self, page_name):
+        """Returns the frame for a page name, building it on first use."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            with tracing.span("build_frame", page=page_name):
+                frame = FRAME_FACTORIES[page_name](parent=self.container, controller=self)
             self.frames[page_name] = frame
             frame.grid(row=0, column=0, sticky="nsew")
-
-        self.show_frame("HomePage")
+        return frame
 
     def show_frame(self, page_name, project_file=None):
         """Shows a frame for the given page name."""
-        frame = self.frames[page_name]
-        if page_name == "EditorPage":
-            # Use a dedicated method in EditorPage to load data
-            frame.load_data(project_file)
-        elif page_name == "HomePage":
-            # Refresh the project list every time we show the home page
-            frame.refresh_project_list()
-            
+        with tracing.span("show_frame", page=page_name):
+            frame = self.get_frame(page_name)
+            if page_name == "EditorPage":
+                # Use a dedicated method in EditorPage to load data
+                frame.load_data(project_file)
+            elif page_name == "HomePage":
+                # Refresh the project list every time we show the home page
+                frame.refresh_project_list()
+
         frame.tkraise()
+        self.current_frame = page_name
+
+    def setup_menu(self):
+        """Adds the Tools menu for recording performance traces."""
+        menubar = tk.Menu(self)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        self.trace_var = tk.BooleanVar(value=tracing.tracer.enabled)
+        tools_menu.add_checkbutton(label="Record Performance Trace", variable=self.trace_var,
+                                   command=self.toggle_trace)
+        tools_menu.add_command(label="Save Performance Trace...", command=self.save_trace)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        self.config(menu=menubar)
+
+    def toggle_trace(self):
+        """Starts a fresh recording, or stops recording and offers to save it."""
+        if self.trace_var.get():
+            tracing.tracer.clear()
+            tracing.tracer.enable()
+        else:
+            tracing.tracer.disable()
+            self.save_trace()
+
+    def save_trace(self):
+        """Saves the recorded spans as Chrome trace JSON to attach to a slowness report."""
+        from tkinter import filedialog, messagebox
+        if not tracing.tracer.events:
+            messagebox.showinfo("No Trace", "Nothing has been recorded yet.\n\n"
+                                "Turn on Tools > Record Performance Trace, repeat the slow steps, then save.")
+            return
+        default_path = tracing.default_trace_path()
+        save_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Chrome Trace", "*.json")],
+                                                 initialfile=os.path.basename(default_path),
+                                                 title="Save Performance Trace")
+        if not save_path:
+            return
+        try:
+            tracing.tracer.dump(save_path)
+            messagebox.showinfo("Trace Saved", f"Trace saved to {save_path}\n\n"
+                                "Open it in chrome://tracing or ui.perfetto.dev, or attach it to a report.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save trace: {e}")
+
+    def on_close(self):
+        """Writes any autosaved editor changes into the project file before exiting."""
+        editor_frame = self.frames.get("EditorPage")
+        if editor_frame is not None:
+            editor_frame.flush_autosave()
+        self.destroy()
+
+def measure_startup(app, imports_done, budget_ms=None):
+    """Prints the time from process start to the first drawn window, then closes the app."""
+    def report():
+        app.update_idletasks()
+        now = time.perf_counter()
+        total_ms = (now - STARTED_AT) * 1000
+        print(f"Startup: {total_ms:.0f} ms (imports {(imports_done - STARTED_AT) * 1000:.0f} ms, "
+              f"window {(now - imports_done) * 1000:.0f} ms)")
+        if budget_ms is not None and total_ms > budget_ms:
+            print(f"Startup is over the budget of {budget_ms:.0f} ms", file=sys.stderr)
+            app.exit_code = 1
+        app.destroy()
+
+    app.after_idle(report)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Visual Manufacturing Procedures Tool")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="Print how long startup took and exit")
+    parser.add_argument("--budget", type=float, default=None, metavar="MS",
+                        help="With --startup-time, exit with status 1 if startup took longer than this")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    imports_done = time.perf_counter()
     app = App()
+    app.exit_code = 0
+    if args.startup_time:
+        measure_startup(app, imports_done, args.budget)
     app.mainloop()
+    sys.exit(app.exit_code)
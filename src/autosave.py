@@ -0,0 +1,140 @@
+"""
+Append-only autosave journal for the editor.
+Edits are appended as small JSON-lines records to <project>.journal next to the
+project file, so an autosave costs I/O proportional to what changed rather than
+to the size of the project. The journal is folded back into the project file
+(compacted) on save, when it grows too large and when the editor closes. After a
+crash it is replayed on top of the project file when the project is next opened.
+"""
+
+import hashlib
+import json
+import os
+
+from .page import loaded_pages, page_dicts
+
+JOURNAL_SUFFIX = '.journal'
+COMPACT_BYTES = 256 * 1024  # Journal size at which autosave folds it into the project file
+
+def journal_path_for(project_file):
+    return project_file + JOURNAL_SUFFIX
+
+def page_digest(page_dict):
+    """Fingerprints a page's data, so the journal can spot changed pages without keeping a copy of them."""
+    data = json.dumps(page_dict, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).digest()
+
+def file_signature(path):
+    """Identifies one version of the project file by its size and mtime."""
+    st = os.stat(path)
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+class ProjectJournal:
+    """Appends page-level change records for one version of a project file.
+
+    The journal keeps a digest of each page as last written, so sync() only
+    writes the pages that differ. Inserts and deletes are recorded explicitly
+    by the caller to keep the digests aligned with the page list.
+    """
+
+    def __init__(self, project_file, pages):
+        self.project_file = project_file
+        self.path = journal_path_for(project_file)
+        self.signature = file_signature(project_file)
+        self.digests = [page_digest(page_dict) for page_dict in page_dicts(pages)]
+        self.record_count = 0
+        self.size = 0
+        self.file = None
+
+    def append(self, records):
+        if self.file is None:
+            # The file is only created on the first change, and always starts with its base
+            self.file = open(self.path, 'w', encoding='utf-8')
+            records = [{'op': 'base', 'signature': self.signature}] + records
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        self.file.write(data)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.size += len(data)
+        self.record_count += len(records)
+
+    def sync(self, pages):
+        """Appends the pages that changed since the last sync. Returns the number of pages written."""
+        records = []
+        for index, page in loaded_pages(pages):
+            current = page.to_dict()
+            digest = page_digest(current)
+            if digest != self.digests[index]:
+                records.append({'op': 'set', 'index': index, 'fields': current})
+                self.digests[index] = digest
+        if records:
+            self.append(records)
+        return len(records)
+
+    def insert(self, index, page):
+        page_dict = page.to_dict()
+        self.append([{'op': 'insert', 'index': index, 'page': page_dict}])
+        self.digests.insert(index, page_digest(page_dict))
+
+    def delete(self, index):
+        self.append([{'op': 'delete', 'index': index}])
+        del self.digests[index]
+
+    @property
+    def has_changes(self):
+        return self.record_count > 0
+
+    def needs_compaction(self):
+        return self.size >= COMPACT_BYTES
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def discard(self):
+        """Closes and removes the journal, e.g. after its changes were written to the project file."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def apply_record(page_dicts, record):
+    op = record['op']
+    if op == 'set':
+        page_dicts[record['index']].update(record['fields'])
+    elif op == 'insert':
+        page_dicts.insert(record['index'], record['page'])
+    elif op == 'delete':
+        del page_dicts[record['index']]
+    else:
+        raise ValueError(f"unknown journal record '{op}'")
+
+def recover_pages(project_file, page_dicts):
+    """Replays a leftover journal onto the page dicts loaded from project_file.
+
+    Returns the number of records applied (0 if there was nothing to recover).
+    A journal written against a different version of the project file is
+    ignored, and a torn final line from a crash ends the replay.
+    """
+    path = journal_path_for(project_file)
+    if not os.path.exists(path):
+        return 0
+    applied = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if line_number == 0:
+                if record.get('op') != 'base' or record.get('signature') != file_signature(project_file):
+                    print(f"Ignoring stale autosave journal {path}")
+                    return 0
+                continue
+            try:
+                apply_record(page_dicts, record)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Stopped replaying autosave journal at line {line_number + 1}: {e}")
+                break
+            applied += 1
+    return applied
@@ -0,0 +1,123 @@
+"""
+PDF export on a background thread.
+The editor hands over a snapshot of its pages, so it stays usable (and its
+pages can keep changing) while the export runs. A non-modal dialog shows page
+progress and can cancel; results come back through the Tk event loop.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from .page import Page, copy_page_dict, page_dicts
+from .pdf_export import ExportCancelled, export_pages_to_pdf
+
+def snapshot_pages(pages):
+    """Copies pages so the export is not affected by edits made while it runs."""
+    return [Page.from_dict(copy_page_dict(page_dict)) for page_dict in page_dicts(pages)]
+
+class ExportJob:
+    """Runs export_pages_to_pdf on a worker thread and reports on a queue."""
+
+    def __init__(self, pages, save_path, target_dpi=None):
+        self.pages = pages
+        self.save_path = save_path
+        self.target_dpi = target_dpi
+        self.events = queue.Queue()  # ('progress', done, total), ('done', path), ('cancelled',) or ('failed', message)
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="pdf-export", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            export_pages_to_pdf(self.pages, self.save_path, self.target_dpi,
+                                on_progress=lambda done, total: self.events.put(('progress', done, total)),
+                                cancel_event=self.cancel_event)
+            self.events.put(('done', self.save_path))
+        except ExportCancelled:
+            self.events.put(('cancelled',))
+        except Exception as e:
+            self.events.put(('failed', str(e)))
+
+class ExportProgressDialog:
+    """Shows export progress with a cancel button, without blocking the editor."""
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, parent, pages, save_path, target_dpi=None, on_complete=None):
+        self.parent = parent
+        self.total = len(pages)
+        self.save_path = save_path
+        self.on_complete = on_complete
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Exporting PDF")
+        self.dialog.geometry("420x150")
+        self.dialog.transient(parent)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.setup_ui()
+
+        self.job = ExportJob(pages, save_path, target_dpi)
+        self.job.start()
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+
+    def setup_ui(self):
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.status_label = tk.Label(main_frame, text=f"Rendering page 0 of {self.total}...", font=("Arial", 10, "bold"))
+        self.status_label.pack(anchor=tk.W)
+
+        self.progress = ttk.Progressbar(main_frame, maximum=max(self.total, 1), length=380)
+        self.progress.pack(fill=tk.X, pady=10)
+
+        self.cancel_btn = tk.Button(main_frame, text="Cancel", command=self.cancel,
+                                    bg='#6c757d', fg='white', padx=15, pady=3)
+        self.cancel_btn.pack(side=tk.RIGHT)
+
+    def cancel(self):
+        self.cancel_btn.config(state=tk.DISABLED, text="Cancelling...")
+        self.job.cancel()
+
+    def poll(self):
+        outcome = None
+        while True:
+            try:
+                event = self.job.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'progress':
+                done, total = event[1], event[2]
+                self.progress['value'] = done
+                if done < total:
+                    self.status_label.config(text=f"Rendering page {done + 1} of {total}...")
+                else:
+                    self.status_label.config(text="Writing PDF...")
+            else:
+                outcome = event
+
+        if outcome is None:
+            self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+        else:
+            self.finish(outcome)
+
+    def finish(self, outcome):
+        self.dialog.destroy()
+        if outcome[0] == 'done':
+            messagebox.showinfo("Success", f"PDF exported to {self.save_path}", parent=self.parent)
+        elif outcome[0] == 'failed':
+            messagebox.showerror("Error", f"Failed to export PDF: {outcome[1]}", parent=self.parent)
+        if self.on_complete:
+            self.on_complete(outcome[0])
+
+def export_in_background(parent, pages, save_path, target_dpi=None, on_complete=None):
+    """Exports a snapshot of pages to save_path on a worker thread with a progress dialog."""
+    return ExportProgressDialog(parent, snapshot_pages(pages), save_path, target_dpi, on_complete)
@@ -0,0 +1,113 @@
+"""
+Headless batch export of VMP projects to PDF.
+Each project is rendered in its own worker process, so a large folder of
+projects can be re-exported without the Tk editor.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .page import load_project_pages
+from .pdf_export import export_pages_to_pdf, DEFAULT_EXPORT_DPI
+
+PROJECT_EXTENSIONS = ('.vmp', '.vmpz')
+
+class ExportResult:
+    """Outcome of exporting a single project."""
+    def __init__(self, project_file, pdf_path=None, seconds=0.0, error=None):
+        self.project_file = project_file
+        self.pdf_path = pdf_path
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def find_projects(targets):
+    """Expands directories, glob patterns and file paths into a sorted list of project files."""
+    project_files = set()
+    for target in targets:
+        if os.path.isdir(target):
+            for entry in os.scandir(target):
+                if entry.is_file() and entry.name.lower().endswith(PROJECT_EXTENSIONS):
+                    project_files.add(os.path.abspath(entry.path))
+        else:
+            for path in glob.glob(target):
+                if os.path.isfile(path) and path.lower().endswith(PROJECT_EXTENSIONS):
+                    project_files.add(os.path.abspath(path))
+    return sorted(project_files)
+
+def pdf_path_for(project_file, output_dir=None):
+    """Returns the PDF path for a project, next to it unless output_dir is given."""
+    pdf_filename = os.path.splitext(os.path.basename(project_file))[0] + '.pdf'
+    return os.path.join(output_dir or os.path.dirname(project_file), pdf_filename)
+
+def find_pdf_collisions(project_files, output_dir=None):
+    """Returns {pdf path: [project files]} for PDFs more than one project would be written to."""
+    targets = {}
+    for project_file in project_files:
+        pdf_path = os.path.normcase(os.path.abspath(pdf_path_for(project_file, output_dir)))
+        targets.setdefault(pdf_path, []).append(project_file)
+    return {pdf_path: paths for pdf_path, paths in targets.items() if len(paths) > 1}
+
+def export_project(project_file, output_dir=None, target_dpi=DEFAULT_EXPORT_DPI):
+    """Exports one project to PDF. Runs inside a worker process."""
+    start = time.perf_counter()
+    pdf_path = pdf_path_for(project_file, output_dir)
+    try:
+        pages = load_project_pages(project_file)
+        export_pages_to_pdf(pages, pdf_path, target_dpi)
+        return ExportResult(project_file, pdf_path, time.perf_counter() - start)
+    except Exception as e:
+        return ExportResult(project_file, None, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+def run_batch_export(project_files, output_dir=None, jobs=None, on_result=None, target_dpi=DEFAULT_EXPORT_DPI):
+    """Exports all projects on a process pool and returns the results in input order.
+
+    jobs of None, 0 or less uses one worker per CPU. Raises ValueError if two projects would write the same PDF.
+    """
+    collisions = find_pdf_collisions(project_files, output_dir)
+    if collisions:
+        pdf_path, paths = sorted(collisions.items())[0]
+        raise ValueError(f"{len(paths)} projects would be exported to {pdf_path}: " + ", ".join(paths))
+    if jobs is not None and jobs <= 0:
+        jobs = None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(export_project, path, output_dir, target_dpi): path for path in project_files}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory), not just the export
+                result = ExportResult(path, error=f"{type(e).__name__}: {e}")
+            results[path] = result
+            if on_result:
+                on_result(result)
+
+    return [results[path] for path in project_files]
+
+def format_summary(results, wall_seconds):
+    """Builds a per-project timing and error summary."""
+    lines = []
+    name_width = max([len(os.path.basename(r.project_file)) for r in results] + [7])
+    for result in results:
+        name = os.path.basename(result.project_file)
+        status = "ok" if result.ok else "FAILED"
+        lines.append(f"{name:<{name_width}}  {result.seconds:8.2f}s  {status}")
+        if not result.ok:
+            lines.append(f"{'':<{name_width}}  {result.error}")
+
+    failed = sum(1 for r in results if not r.ok)
+    cpu_seconds = sum(r.seconds for r in results)
+    lines.append("")
+    lines.append(f"Exported {len(results) - failed}/{len(results)} project(s) in {wall_seconds:.2f}s "
+                 f"({cpu_seconds:.2f}s of render time), {failed} failed.")
+    return "\n".join(lines)
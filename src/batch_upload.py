@@ -0,0 +1,252 @@
+"""
+Concurrent upload of several projects to SharePoint.
+Projects are bundled and uploaded on a thread pool that shares one pooled HTTP
+session, with a cap on simultaneous uploads per destination host. Each file
+gets a result, and the summary reports overall throughput.
+"""
+
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tkinter import ttk, messagebox
+
+from .chunked_upload import UploadCancelled
+from .sharepoint_uploader import SharePointUploader, UPLOAD_ENDPOINT
+from .vmpz import bundle_for_sharing
+
+UPLOAD_WORKERS = 6
+MAX_UPLOADS_PER_HOST = 3
+
+class UploadResult:
+    """Outcome of uploading a single project."""
+    def __init__(self, project_file, uploaded_path=None, size=0, seconds=0.0, message="", error=None):
+        self.project_file = project_file
+        self.uploaded_path = uploaded_path  # The file actually sent, e.g. its bundle
+        self.size = size
+        self.seconds = seconds
+        self.message = message
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+class HostLimiter:
+    """Caps how many uploads run against the same host at once."""
+
+    def __init__(self, max_per_host=MAX_UPLOADS_PER_HOST):
+        self.max_per_host = max_per_host
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def slot(self, host):
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.semaphores[host]
+
+def destination_host(uploader):
+    """Returns the host uploads will go to: the upload service, or the server of the SharePoint network path."""
+    if UPLOAD_ENDPOINT:
+        return urllib.parse.urlparse(UPLOAD_ENDPOINT).netloc
+    network_root = uploader.find_network_root()
+    if network_root:
+        return network_root.lstrip('\\/').split('\\')[0].split('/')[0]
+    return None
+
+def upload_project(uploader, limiter, host, project_file, subfolder=None, include_images=True, cancel_event=None):
+    """Uploads one project. Runs on a worker thread."""
+    start = time.perf_counter()
+    try:
+        if cancel_event is not None and cancel_event.is_set():
+            raise UploadCancelled()
+        file_path = bundle_for_sharing(project_file) if include_images else project_file
+        size = os.path.getsize(file_path)
+        with limiter.slot(host):
+            if cancel_event is not None and cancel_event.is_set():
+                raise UploadCancelled()
+            if UPLOAD_ENDPOINT:
+                success, message = uploader.upload_via_session(file_path, subfolder, cancel_event=cancel_event)
+            else:
+                success, message = uploader.upload_via_network_path(file_path, subfolder)
+        if cancel_event is not None and cancel_event.is_set() and not success:
+            raise UploadCancelled()
+        if not success:
+            return UploadResult(project_file, file_path, size, time.perf_counter() - start, error=message)
+        return UploadResult(project_file, file_path, size, time.perf_counter() - start, message)
+    except UploadCancelled:
+        return UploadResult(project_file, seconds=time.perf_counter() - start, error="cancelled")
+    except Exception as e:
+        return UploadResult(project_file, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+def run_batch_upload(project_files, subfolder=None, include_images=True, jobs=UPLOAD_WORKERS,
+                     max_per_host=MAX_UPLOADS_PER_HOST, on_result=None, cancel_event=None):
+    """Uploads all projects concurrently and returns the results in input order."""
+    uploader = SharePointUploader()
+    host = destination_host(uploader)
+    if host is None:
+        return [UploadResult(path, error="Could not access SharePoint via network path") for path in project_files]
+
+    limiter = HostLimiter(max_per_host)
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="upload") as executor:
+        futures = {executor.submit(upload_project, uploader, limiter, host, path, subfolder, include_images, cancel_event): path
+                   for path in project_files}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result:
+                on_result(result)
+    return [results[path] for path in project_files]
+
+def format_upload_summary(results, wall_seconds):
+    """Builds per-file results plus overall throughput."""
+    lines = []
+    for result in results:
+        name = os.path.basename(result.project_file)
+        if result.ok:
+            rate = result.size / result.seconds / 1e6 if result.seconds else 0
+            lines.append(f"{name}: {result.size / 1e6:.1f} MB in {result.seconds:.1f}s ({rate:.1f} MB/s)")
+        else:
+            lines.append(f"{name}: FAILED - {result.error}")
+
+    uploaded = [r for r in results if r.ok]
+    total_bytes = sum(r.size for r in uploaded)
+    throughput = total_bytes / wall_seconds / 1e6 if wall_seconds else 0
+    lines.append("")
+    lines.append(f"Uploaded {len(uploaded)}/{len(results)} project(s), {total_bytes / 1e6:.1f} MB "
+                 f"in {wall_seconds:.1f}s ({throughput:.1f} MB/s).")
+    return "\n".join(lines)
+
+class BatchUploadDialog:
+    """Uploads several projects with one dialog: options, progress, per-file results and cancel."""
+
+    POLL_INTERVAL_MS = 100
+
+    def __init__(self, parent, project_files):
+        self.parent = parent
+        self.project_files = project_files
+        self.results = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.done = 0
+        self.started_at = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Upload to SharePoint")
+        self.dialog.geometry("560x460")
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(main_frame, text=f"Upload {len(self.project_files)} project(s) to SharePoint",
+                 font=("Arial", 14, "bold")).pack(anchor=tk.W, pady=(0, 10))
+
+        tk.Label(main_frame, text="Subfolder (optional):", font=("Arial", 10, "bold")).pack(anchor=tk.W)
+        self.folder_entry = tk.Entry(main_frame)
+        self.folder_entry.pack(fill=tk.X, pady=(5, 0))
+        self.folder_entry.insert(0, "VMP-Files")
+
+        self.bundle_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(main_frame, text="Include images (upload as .vmpz bundles)",
+                       variable=self.bundle_var, font=("Arial", 9)).pack(anchor=tk.W, pady=(5, 10))
+
+        self.status_label = tk.Label(main_frame, text="", font=("Arial", 10, "bold"))
+        self.status_label.pack(anchor=tk.W)
+
+        self.progress = ttk.Progressbar(main_frame, maximum=max(len(self.project_files), 1))
+        self.progress.pack(fill=tk.X, pady=5)
+
+        self.result_list = tk.Listbox(main_frame, font=("Arial", 9), height=10)
+        self.result_list.pack(fill=tk.BOTH, expand=True, pady=5)
+        for path in self.project_files:
+            self.result_list.insert(tk.END, f"{os.path.basename(path)}: waiting")
+
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        self.close_btn = tk.Button(button_frame, text="Close", command=self.close,
+                                   bg='#6c757d', fg='white', padx=15, pady=3)
+        self.close_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        self.upload_btn = tk.Button(button_frame, text="Upload", command=self.start,
+                                    bg='#0078d4', fg='white', padx=15, pady=3)
+        self.upload_btn.pack(side=tk.RIGHT)
+
+    def start(self):
+        subfolder = self.folder_entry.get().strip() or None
+        include_images = self.bundle_var.get()
+        self.upload_btn.config(state=tk.DISABLED)
+        self.close_btn.config(text="Cancel")
+        self.status_label.config(text=f"Uploading 0 of {len(self.project_files)}...")
+        self.started_at = time.perf_counter()
+        threading.Thread(target=self.run, args=(subfolder, include_images), name="batch-upload", daemon=True).start()
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+
+    def run(self, subfolder, include_images):
+        try:
+            results = run_batch_upload(self.project_files, subfolder, include_images,
+                                       on_result=lambda result: self.results.put(('result', result)),
+                                       cancel_event=self.cancel_event)
+        except Exception as e:
+            results = [UploadResult(path, error=f"{type(e).__name__}: {e}") for path in self.project_files]
+        self.results.put(('finished', results))
+
+    def poll(self):
+        finished = None
+        while True:
+            try:
+                kind, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'result':
+                self.show_result(value)
+            else:
+                finished = value
+
+        if finished is None:
+            self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+            return
+
+        wall_seconds = time.perf_counter() - self.started_at
+        summary = format_upload_summary(finished, wall_seconds)
+        for result in finished:
+            self.show_result(result)
+        self.status_label.config(text=summary.splitlines()[-1])
+        self.close_btn.config(text="Close", state=tk.NORMAL)
+        self.started_at = None
+        if any(not r.ok for r in finished):
+            messagebox.showwarning("Upload Finished", summary, parent=self.dialog)
+
+    def show_result(self, result):
+        index = self.project_files.index(result.project_file)
+        if self.result_list.get(index).endswith(": waiting"):
+            self.done += 1
+        name = os.path.basename(result.project_file)
+        if result.ok:
+            text = f"{name}: uploaded ({result.size / 1e6:.1f} MB, {result.seconds:.1f}s)"
+        else:
+            text = f"{name}: FAILED - {result.error}"
+        self.result_list.delete(index)
+        self.result_list.insert(index, text)
+        self.result_list.itemconfig(index, fg='#2e7d32' if result.ok else '#c62828')
+        self.progress['value'] = self.done
+        self.status_label.config(text=f"Uploading {self.done} of {len(self.project_files)}...")
+
+    def close(self):
+        if self.started_at is not None:
+            # Uploads in progress: stop queued files and let running chunks finish
+            self.cancel_event.set()
+            self.close_btn.config(text="Cancelling...", state=tk.DISABLED)
+            return
+        self.dialog.destroy()
+
+def batch_upload(parent, project_files):
+    """Opens the batch upload dialog for the given project files."""
+    return BatchUploadDialog(parent, list(project_files))
@@ -0,0 +1,188 @@
+"""
+Parallel bulk import of images into the library.
+Files (or whole folders, recursively) are checked to decode, copied into the
+content-addressed ImageStore and verified on a thread pool, while a progress
+dialog keeps the window responsive and allows cancelling.
+"""
+
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from .image_store import CopyMismatch, IMAGE_EXTENSIONS
+IMPORT_WORKERS = 8
+
+def collect_image_files(paths):
+    """Expands directories recursively and returns the image files to import."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        files.append(os.path.join(root, name))
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            files.append(path)
+    return files
+
+class BulkImporter:
+    """Imports files into an ImageStore on a thread pool and reports each result on a queue."""
+
+    def __init__(self, store, max_workers=IMPORT_WORKERS):
+        self.store = store
+        self.max_workers = max_workers
+        self.results = queue.Queue()  # (path, status, detail); status is imported/duplicate/failed/cancelled
+        self.cancel_event = threading.Event()
+        self.executor = None
+
+    def start(self, files):
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import")
+        for path in files:
+            future = self.executor.submit(self.import_one, path)
+            future.add_done_callback(lambda f, p=path: self.report(f, p))
+        self.executor.shutdown(wait=False)
+
+    def cancel(self):
+        """Stops queued files from starting; files already being copied finish normally."""
+        self.cancel_event.set()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def report(self, future, path):
+        if future.cancelled():
+            self.results.put((path, 'cancelled', None))
+        elif future.exception() is not None:
+            self.results.put((path, 'failed', str(future.exception())))
+        else:
+            status, detail = future.result()
+            self.results.put((path, status, detail))
+
+    def import_one(self, path):
+        """Runs on a worker thread: skip known images, check new ones decode, then copy and verify them."""
+        if self.cancel_event.is_set():
+            return 'cancelled', None
+        content_hash = self.store.source_hash(path)
+        if self.store.object_path(content_hash):
+            # Already stored, so it decoded when it was first imported; only its name is recorded
+            stored_path, _ = self.store.import_file(path, content_hash)
+            return 'duplicate', stored_path
+
+        try:
+            # Decode the pixel data; verify() only checks the structure, so truncated images pass it
+            with Image.open(path) as img:
+                img.load()
+        except Exception as e:
+            return 'failed', f"not a readable image ({e})"
+
+        try:
+            # The copy is checked against the checksum before it is added to the library
+            stored_path, duplicate = self.store.import_file(path, content_hash)
+        except CopyMismatch:
+            return 'failed', "copy did not match the source checksum"
+        if duplicate:
+            return 'duplicate', stored_path
+        return 'imported', stored_path
+
+class ImportProgressDialog:
+    """Shows bulk import progress with a cancel button."""
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, parent, store, files, on_complete=None):
+        self.parent = parent
+        self.store = store
+        self.total = len(files)
+        self.on_complete = on_complete
+        self.counts = {'imported': 0, 'duplicate': 0, 'failed': 0, 'cancelled': 0}
+        self.failures = []
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Importing Images")
+        self.dialog.geometry("420x170")
+        self.dialog.transient(parent)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.setup_ui()
+
+        self.importer = BulkImporter(store)
+        self.importer.start(files)
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+
+    def setup_ui(self):
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.status_label = tk.Label(main_frame, text=f"Importing 0 of {self.total}...", font=("Arial", 10, "bold"))
+        self.status_label.pack(anchor=tk.W)
+
+        self.progress = ttk.Progressbar(main_frame, maximum=max(self.total, 1), length=380)
+        self.progress.pack(fill=tk.X, pady=10)
+
+        self.detail_label = tk.Label(main_frame, text="", font=("Arial", 9), fg='#666666')
+        self.detail_label.pack(anchor=tk.W)
+
+        self.cancel_btn = tk.Button(main_frame, text="Cancel", command=self.cancel,
+                                    bg='#6c757d', fg='white', padx=15, pady=3)
+        self.cancel_btn.pack(side=tk.RIGHT, pady=(10, 0))
+
+    def cancel(self):
+        self.cancel_btn.config(state=tk.DISABLED, text="Cancelling...")
+        self.importer.cancel()
+
+    def poll(self):
+        while True:
+            try:
+                path, status, detail = self.importer.results.get_nowait()
+            except queue.Empty:
+                break
+            self.counts[status] += 1
+            if status == 'failed':
+                self.failures.append(f"{os.path.basename(path)}: {detail}")
+
+        done = sum(self.counts.values())
+        self.progress['value'] = done
+        self.status_label.config(text=f"Importing {done} of {self.total}...")
+        self.detail_label.config(text=f"{self.counts['imported']} new, {self.counts['duplicate']} already in library, "
+                                      f"{self.counts['failed']} failed")
+
+        if done < self.total:
+            self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+        else:
+            self.finish()
+
+    def finish(self):
+        try:
+            self.store.save()
+        except OSError as e:
+            print(f"Could not save image aliases: {e}")
+        self.dialog.destroy()
+
+        message = f"Successfully imported {self.counts['imported']} image(s)."
+        if self.counts['duplicate']:
+            message += f"\n{self.counts['duplicate']} image(s) were already in the library."
+        if self.counts['cancelled']:
+            message += f"\n{self.counts['cancelled']} image(s) were skipped because the import was cancelled."
+        if self.failures:
+            message += f"\n\n{len(self.failures)} image(s) failed:\n" + "\n".join(self.failures[:10])
+            if len(self.failures) > 10:
+                message += f"\n...and {len(self.failures) - 10} more"
+            messagebox.showwarning("Import Finished", message, parent=self.parent)
+        else:
+            messagebox.showinfo("Import Complete", message, parent=self.parent)
+
+        if self.on_complete:
+            self.on_complete(self.counts)
+
+def bulk_import(parent, store, paths, on_complete=None):
+    """Imports files and folders in the background with a progress dialog."""
+    files = collect_image_files(paths)
+    if not files:
+        messagebox.showinfo("Import Images", "No image files were found to import.", parent=parent)
+        return None
+    return ImportProgressDialog(parent, store, files, on_complete)
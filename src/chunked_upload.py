@@ -0,0 +1,212 @@
+"""
+Chunked, resumable uploads over HTTP upload sessions.
+The protocol follows the OneDrive/SharePoint upload-session shape: a POST
+creates a session and returns its uploadUrl; the file is then PUT in
+fixed-size chunks with Content-Range headers, and the server confirms how much
+it has committed through nextExpectedRanges. Sessions are remembered on disk,
+so an interrupted upload continues from the last confirmed offset, even after
+the app restarts.
+"""
+
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import tracing
+
+CHUNK_SIZE = 10 * 320 * 1024  # Upload sessions want chunks in multiples of 320 KiB
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5  # Seconds, doubled after each consecutive failure
+REQUEST_TIMEOUT = 30
+HTTP_POOL_SIZE = 8  # Keep-alive connections kept per host
+
+_http_session = None
+_session_store = None
+_shared_lock = threading.Lock()
+
+def get_http_session():
+    """Returns the shared requests.Session, so uploads reuse pooled keep-alive connections."""
+    global _http_session
+    with _shared_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+            _http_session.mount("https://", adapter)
+            _http_session.mount("http://", adapter)
+        return _http_session
+
+class UploadError(Exception):
+    """Raised when an upload cannot make progress; its session is kept so it can be resumed."""
+
+class UploadCancelled(Exception):
+    """Raised when an upload is cancelled between chunks."""
+
+def next_expected_offset(payload):
+    """Returns the first offset the server still wants, from a nextExpectedRanges list like ["26214400-"]."""
+    ranges = payload.get('nextExpectedRanges') or []
+    if not ranges:
+        return None
+    return int(ranges[0].split('-')[0])
+
+class UploadSessionStore:
+    """Remembers open upload sessions per file version in .vmp-cache/upload_sessions.json."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.getcwd(), ".vmp-cache", "upload_sessions.json")
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()  # Held from snapshot to replace, so an older snapshot never lands last
+        try:
+            with open(self.path, 'r') as f:
+                self.sessions = json.load(f)
+        except (OSError, ValueError):
+            self.sessions = {}
+
+    @staticmethod
+    def key(file_path, create_url):
+        st = os.stat(file_path)
+        return f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|{create_url}"
+
+    def get(self, key):
+        with self.lock:
+            return self.sessions.get(key)
+
+    def put(self, key, upload_url):
+        with self.lock:
+            self.sessions[key] = upload_url
+        self.save()
+
+    def remove(self, key):
+        with self.lock:
+            if self.sessions.pop(key, None) is None:
+                return
+        self.save()
+
+    def save(self):
+        with self.write_lock:
+            with self.lock:
+                data = json.dumps(self.sessions, indent=1)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not save upload sessions: {e}")
+
+def get_session_store():
+    """Returns the shared UploadSessionStore; concurrent uploads must not overwrite each other's sessions."""
+    global _session_store
+    with _shared_lock:
+        if _session_store is None:
+            _session_store = UploadSessionStore()
+        return _session_store
+
+class ChunkedUploader:
+    """Uploads files through upload sessions, retrying failed chunks and resuming interrupted uploads."""
+
+    def __init__(self, http=None, chunk_size=CHUNK_SIZE, max_retries=MAX_RETRIES,
+                 retry_backoff=RETRY_BACKOFF, store=None):
+        self.http = http or get_http_session()
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.store = store or get_session_store()
+
+    def create_session(self, create_url, file_name):
+        response = self.http.post(create_url, json={'item': {'name': file_name, '@microsoft.graph.conflictBehavior': 'replace'}},
+                                  timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()['uploadUrl']
+
+    def session_offset(self, upload_url):
+        """Asks the server how much of the file it has committed. Returns None if the session is gone."""
+        response = self.http.get(upload_url, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        offset = next_expected_offset(response.json())
+        return 0 if offset is None else offset
+
+    def upload(self, file_path, create_url, on_progress=None, cancel_event=None):
+        """Uploads file_path through a session created at create_url and returns the server's final response JSON.
+
+        on_progress(confirmed_bytes, total_bytes) is called after each committed chunk.
+        """
+        total = os.path.getsize(file_path)
+        key = self.store.key(file_path, create_url)
+        upload_url = self.store.get(key)
+        offset = None
+        if upload_url:
+            try:
+                offset = self.session_offset(upload_url)
+            except requests.RequestException:
+                offset = None
+        if offset is None:
+            upload_url = self.create_session(create_url, os.path.basename(file_path))
+            self.store.put(key, upload_url)
+            offset = 0
+
+        failures = 0  # Consecutive failed chunks
+        restarts = 0  # Sessions lost during this upload
+        with open(file_path, 'rb') as f:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise UploadCancelled()
+                if on_progress:
+                    on_progress(offset, total)
+
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+                end = offset + len(chunk) - 1
+                content_range = f"bytes {offset}-{end}/{total}" if chunk else f"bytes */{total}"
+                headers = {'Content-Length': str(len(chunk)), 'Content-Range': content_range}
+                try:
+                    with tracing.span("upload_chunk", offset=offset, size=len(chunk)):
+                        response = self.http.put(upload_url, data=chunk, headers=headers, timeout=REQUEST_TIMEOUT)
+                except requests.RequestException as e:
+                    response, error = None, str(e)
+                else:
+                    error = f"HTTP {response.status_code}"
+
+                if response is not None and response.status_code in (200, 201):
+                    tracing.count("upload_bytes_sent", total - offset)
+                    self.store.remove(key)
+                    if on_progress:
+                        on_progress(total, total)
+                    return response.json() if response.content else {}
+                if response is not None and response.status_code == 202:
+                    # The server may commit less than was sent; always continue from what it confirms
+                    confirmed = next_expected_offset(response.json())
+                    confirmed = offset + len(chunk) if confirmed is None else confirmed
+                    # Count only what the server committed, not what was sent
+                    tracing.count("upload_bytes_sent", max(confirmed - offset, 0))
+                    offset = confirmed
+                    failures = 0
+                    continue
+                if response is not None and response.status_code == 404:
+                    # Session expired; start a new one from the beginning
+                    restarts += 1
+                    if restarts > self.max_retries:
+                        raise UploadError(f"Upload of {os.path.basename(file_path)} keeps losing its session")
+                    upload_url = self.create_session(create_url, os.path.basename(file_path))
+                    self.store.put(key, upload_url)
+                    offset = 0
+                    continue
+                if response is not None and 400 <= response.status_code < 500 and response.status_code not in (409, 416, 429):
+                    raise UploadError(f"Upload of {os.path.basename(file_path)} was rejected: {error}")
+
+                # Transient failure, or our offset disagrees with the server's: back off, then resync
+                failures += 1
+                if failures > self.max_retries:
+                    raise UploadError(f"Upload of {os.path.basename(file_path)} stopped at {offset} of {total} bytes: {error}")
+                time.sleep(self.retry_backoff * (2 ** (failures - 1)))
+                try:
+                    confirmed = self.session_offset(upload_url)
+                except requests.RequestException:
+                    continue
+                if confirmed is not None:
+                    offset = confirmed
@@ -0,0 +1,101 @@
+"""
+Incremental change detection for the project and image folders.
+A DirectorySnapshot remembers the size and mtime of every matching file and
+reports what was added, removed or modified since the previous scan, so views
+can apply just the delta instead of rebuilding everything.
+"""
+
+import os
+
+class DirectoryDelta:
+    """Filenames that changed between two scans."""
+    def __init__(self, added=None, removed=None, modified=None, initial=False):
+        self.added = added or []
+        self.removed = removed or []
+        self.modified = modified or []
+        self.initial = initial
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return (f"DirectoryDelta(added={len(self.added)}, removed={len(self.removed)}, "
+                f"modified={len(self.modified)}, initial={self.initial})")
+
+class DirectorySnapshot:
+    """Tracks the files in one directory between scans."""
+
+    def __init__(self, path, extensions=None):
+        self.path = path
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+        self.entries = {}  # filename -> (size, mtime_ns)
+        self.stats = {}  # filename -> os.stat_result from the last scan
+        self.scanned = False
+
+    def matches(self, name):
+        return self.extensions is None or name.lower().endswith(self.extensions)
+
+    def scan(self):
+        """Rescans the directory and returns what changed since the previous scan."""
+        entries = {}
+        stats = {}
+        if os.path.isdir(self.path):
+            with os.scandir(self.path) as it:
+                for dir_entry in it:
+                    if not self.matches(dir_entry.name):
+                        continue
+                    try:
+                        if not dir_entry.is_file():
+                            continue
+                        st = dir_entry.stat()
+                    except OSError:
+                        continue  # Removed while we were scanning
+                    entries[dir_entry.name] = (st.st_size, st.st_mtime_ns)
+                    stats[dir_entry.name] = st
+
+        old = self.entries
+        delta = DirectoryDelta(
+            added=sorted(name for name in entries if name not in old),
+            removed=sorted(name for name in old if name not in entries),
+            modified=sorted(name for name, sig in entries.items() if name in old and old[name] != sig),
+            initial=not self.scanned,
+        )
+        self.entries = entries
+        self.stats = stats
+        self.scanned = True
+        return delta
+
+    def names(self):
+        return sorted(self.entries)
+
+    def paths(self):
+        return [os.path.join(self.path, name) for name in self.names()]
+
+class DirectoryPoller:
+    """Periodically rescans a snapshot from the Tk event loop and reports non-empty deltas."""
+
+    def __init__(self, widget, scan, on_change, interval_ms=5000):
+        self.widget = widget
+        self.scan = scan
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.job = None
+
+    def start(self):
+        if self.job is None:
+            self.job = self.widget.after(self.interval_ms, self.poll)
+
+    def stop(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+    def poll(self):
+        self.job = None
+        try:
+            delta = self.scan()
+            if delta:
+                self.on_change(delta)
+        except Exception as e:
+            print(f"Directory poll failed: {e}")
+        self.start()
@@ -1,9 +1,13 @@
 import os
-import shutil
+import queue
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import webbrowser
 
+from .network_copy import CopyCancelled, copy_verified
+from .vmpz import BUNDLE_EXTENSION, SIGNATURE_SUFFIX, bundle_for_sharing, is_bundle
+
 class FileSharing:
     """Alternative file sharing options when SharePoint Graph API is blocked."""
     
@@ -23,21 +27,28 @@ class FileSharing:
         if not destination_folder:
             return False
         
-        try:
-            filename = os.path.basename(file_path)
-            destination_path = os.path.join(destination_folder, filename)
-            
-            # Copy the file
-            shutil.copy2(file_path, destination_path)
-            
+        # Plain .vmp files only reference images on this machine, so they are shared as a bundle
+        bundle = not is_bundle(file_path)
+        filename = os.path.basename(file_path)
+        if bundle:
+            filename = os.path.splitext(filename)[0] + BUNDLE_EXTENSION
+        destination_path = os.path.join(destination_folder, filename)
+        
+        # Copy the file on a worker thread with progress; an interrupted copy resumes next time
+        dialog = NetworkCopyDialog(parent, file_path, destination_path, bundle)
+        parent.wait_window(dialog.dialog)
+        outcome = dialog.outcome
+        
+        if outcome[0] in ('copied', 'resumed', 'skipped'):
+            note = "An identical file was already there, so nothing was copied.\n\n" if outcome[0] == 'skipped' else ""
             messagebox.showinfo("Success", 
-                               f"File copied successfully to:\n{destination_path}\n\n" +
+                               f"File copied successfully to:\n{destination_path}\n\n" + note +
                                "You can now share this location with your team.")
             return True
-            
-        except Exception as e:
-            messagebox.showerror("Copy Failed", f"Failed to copy file: {str(e)}")
-            return False
+        if outcome[0] == 'failed':
+            messagebox.showerror("Copy Failed", f"Failed to copy file: {outcome[1]}\n\n" +
+                                 "Copying again will continue where this copy stopped.")
+        return False
     
     @staticmethod
     def open_sharepoint_in_browser(parent):
@@ -77,6 +88,89 @@ class FileSharing:
                                  f"Please manually create an email and attach:\n{file_path}")
             return False
 
+class NetworkCopyDialog:
+    """Shows the progress of a verified network copy, with a cancel button."""
+    
+    POLL_INTERVAL_MS = 50
+    
+    def __init__(self, parent, source, destination, bundle=False):
+        self.source = source
+        self.destination = destination
+        self.bundle = bundle  # Bundle the project with its images first and copy the bundle
+        self.events = queue.Queue()  # ('status', text), ('progress', copied, total) or the outcome
+        self.cancel_event = threading.Event()
+        self.outcome = ('cancelled',)
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Copying to Network Drive")
+        self.dialog.geometry("420x150")
+        self.dialog.transient(parent)
+        self.dialog.resizable(False, False)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        self.setup_ui()
+        
+        threading.Thread(target=self.run, name="network-copy", daemon=True).start()
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+    
+    def setup_ui(self):
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.status_label = tk.Label(main_frame, text=f"Copying {os.path.basename(self.source)}...",
+                                     font=("Arial", 10, "bold"))
+        self.status_label.pack(anchor=tk.W)
+        
+        self.progress = ttk.Progressbar(main_frame, maximum=1, length=380)
+        self.progress.pack(fill=tk.X, pady=10)
+        
+        self.cancel_btn = tk.Button(main_frame, text="Cancel", command=self.cancel,
+                                    bg='#6c757d', fg='white', padx=15, pady=3)
+        self.cancel_btn.pack(side=tk.RIGHT)
+    
+    def run(self):
+        try:
+            source = self.source
+            if self.bundle:
+                self.events.put(('status', "Bundling project and images..."))
+                source = bundle_for_sharing(self.source)
+            outcome = copy_verified(source, self.destination,
+                                    on_progress=lambda copied, total: self.events.put(('progress', copied, total)),
+                                    cancel_event=self.cancel_event)
+            if self.bundle:
+                copy_verified(source + SIGNATURE_SUFFIX, self.destination + SIGNATURE_SUFFIX)
+            self.events.put((outcome,))
+        except CopyCancelled:
+            self.events.put(('cancelled',))
+        except Exception as e:
+            self.events.put(('failed', str(e)))
+    
+    def cancel(self):
+        self.cancel_btn.config(state=tk.DISABLED, text="Cancelling...")
+        self.cancel_event.set()
+    
+    def poll(self):
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'status':
+                self.status_label.config(text=event[1])
+                continue
+            if event[0] != 'progress':
+                self.outcome = event
+                self.dialog.destroy()
+                return
+            copied, total = event[1], event[2]
+            self.progress.config(maximum=max(total, 1), value=copied)
+            if copied < total:
+                self.status_label.config(text=f"Copying... {copied / 1e6:.1f} of {total / 1e6:.1f} MB")
+            else:
+                self.status_label.config(text="Verifying copy...")
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+
 class SharePointBrowserDialog:
     """Dialog to help user navigate to SharePoint for manual upload."""
     
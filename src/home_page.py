@@ -3,8 +3,12 @@ from tkinter import ttk, messagebox
 import os
 import json
 from datetime import datetime
-from .main_window import EditorPage
-from .sharepoint_uploader import upload_to_sharepoint
+from .project_index import ProjectIndex
+from .image_store import get_image_store
+from .dir_snapshot import DirectoryPoller
+
+# How often the projects folder is checked for changes made outside the app
+PROJECT_POLL_INTERVAL_MS = 5000
 
 class HomePage(tk.Frame):
     """Home page for VMP Tool - manages projects and provides navigation."""
@@ -21,9 +25,14 @@ class HomePage(tk.Frame):
             os.makedirs(self.projects_dir)
         if not os.path.exists(self.images_dir):
             os.makedirs(self.images_dir)
+        self.project_index = ProjectIndex(self.projects_dir)
+        self.image_store = get_image_store(self.images_dir)
         
+        # The project list is filled by the controller's show_frame, which runs right after construction
         self.setup_ui()
-        self.refresh_project_list()
+        self.project_poller = DirectoryPoller(self, self.project_index.refresh, self.apply_project_delta,
+                                              interval_ms=PROJECT_POLL_INTERVAL_MS)
+        self.project_poller.start()
     
     def setup_ui(self):
         """Create the home page UI."""
@@ -58,6 +67,13 @@ class HomePage(tk.Frame):
                                      bg='#1abc9c', fg='white',
                                      padx=15, pady=8)
         import_images_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        import_folder_btn = tk.Button(buttons_frame, text="Import Folder",
+                                     command=self.import_image_folder,
+                                     font=("Arial", 10),
+                                     bg='#16a085', fg='white',
+                                     padx=15, pady=8)
+        import_folder_btn.pack(side=tk.LEFT, padx=(0, 10))
         
         # Refresh button
         refresh_btn = tk.Button(buttons_frame, text="Refresh", 
@@ -75,118 +91,151 @@ class HomePage(tk.Frame):
         self.create_project_list(list_frame)
     
     def create_project_list(self, parent):
-        """Create a scrollable list of projects."""
-        # Create frame for the scrollable list
+        """Create a sortable list of projects."""
         list_container = tk.Frame(parent)
         list_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Actions for the selected project
+        buttons_frame = tk.Frame(list_container)
+        buttons_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+        
+        open_btn = tk.Button(buttons_frame, text="Open", 
+                            command=lambda: self.run_on_selection(self.open_project),
+                            bg='#2ecc71', fg='white', padx=15, pady=5)
+        open_btn.pack(pady=2, fill=tk.X)
+        
+        export_btn = tk.Button(buttons_frame, text="Export PDF", 
+                              command=lambda: self.run_on_selection(self.export_project_pdf),
+                              bg='#e74c3c', fg='white', padx=15, pady=5)
+        export_btn.pack(pady=2, fill=tk.X)
+        
+        sharepoint_btn = tk.Button(buttons_frame, text="Upload to SharePoint", 
+                                  command=lambda: self.run_on_selection(self.upload_to_sharepoint),
+                                  bg='#0078d4', fg='white', padx=15, pady=5)
+        sharepoint_btn.pack(pady=2, fill=tk.X)
+        
+        upload_selected_btn = tk.Button(buttons_frame, text="Upload Selected", 
+                                       command=self.upload_selected,
+                                       bg='#0078d4', fg='white', padx=15, pady=5)
+        upload_selected_btn.pack(pady=2, fill=tk.X)
+        
         # Scrollbar
         scrollbar = ttk.Scrollbar(list_container)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Canvas for scrolling
-        self.canvas = tk.Canvas(list_container, yscrollcommand=scrollbar.set)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.canvas.yview)
+        # Treeview only draws the visible rows, so large project folders stay cheap
+        style = ttk.Style(self)
+        style.configure("Projects.Treeview", font=("Arial", 11), rowheight=28)
+        style.configure("Projects.Treeview.Heading", font=("Arial", 10, "bold"))
+        self.project_tree = ttk.Treeview(list_container, columns=("name", "created", "pages"), show="headings",
+                                         selectmode="extended", style="Projects.Treeview",
+                                         yscrollcommand=scrollbar.set)
+        self.project_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.project_tree.yview)
         
-        # Frame inside canvas for project items
-        self.projects_frame = tk.Frame(self.canvas)
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.projects_frame, anchor="nw")
+        for column, heading, width, anchor in (("name", "Name", 400, tk.W),
+                                               ("created", "Created", 180, tk.W),
+                                               ("pages", "Pages", 80, tk.CENTER)):
+            self.project_tree.heading(column, text=heading, command=lambda c=column: self.sort_projects_by(c))
+            self.project_tree.column(column, width=width, anchor=anchor, stretch=(column == "name"))
+        self.project_tree.bind("<Double-1>", lambda e: self.run_on_selection(self.open_project))
+        self.project_tree.bind("<Return>", lambda e: self.run_on_selection(self.open_project))
         
-        # Bind canvas resize
-        self.canvas.bind('<Configure>', self.on_canvas_configure)
-        self.projects_frame.bind('<Configure>', self.on_frame_configure)
-    
-    def on_canvas_configure(self, event):
-        """Handle canvas resize."""
-        self.canvas.itemconfig(self.canvas_window, width=event.width)
-    
-    def on_frame_configure(self, event):
-        """Handle frame resize to update scroll region."""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # Empty state, shown on top of the list when there are no projects
+        self.empty_label = tk.Label(self.project_tree, 
+                                    text="No VMPs created yet.\nClick 'Create New VMP' to get started!",
+                                    font=("Arial", 12), fg='gray', bg='white')
+        
+        self.projects = {}  # filename -> summary from the project index
+        self.sort_column = None  # None keeps the default filename order
+        self.sort_reverse = True  # Most recent first
     
     def refresh_project_list(self):
         """Refresh the list of projects."""
-        # Clear existing items
-        for widget in self.projects_frame.winfo_children():
-            widget.destroy()
-        
-        # Get all project files
-        project_files = []
-        if os.path.exists(self.projects_dir):
-            for file in os.listdir(self.projects_dir):
-                if file.endswith('.vmp'):
-                    project_files.append(file)
-        
-        project_files.sort(reverse=True)  # Most recent first
-        
-        if not project_files:
-            # Show empty state
-            empty_label = tk.Label(self.projects_frame, 
-                                  text="No VMPs created yet.\nClick 'Create New VMP' to get started!",
-                                  font=("Arial", 12), fg='gray')
-            empty_label.pack(pady=50)
-        else:
-            # Show project items
-            for i, filename in enumerate(project_files):
-                self.create_project_item(filename, i)
+        # Only new or changed project files are parsed; the rest come from the index
+        self.apply_project_delta(self.project_index.refresh())
     
-    def create_project_item(self, filename, index):
-        """Create a single project item in the list."""
-        # Load project metadata
-        project_path = os.path.join(self.projects_dir, filename)
-        try:
-            with open(project_path, 'r') as f:
-                project_data = json.load(f)
-        except:
-            return  # Skip corrupted files
-        
-        # Project item frame
-        item_frame = tk.Frame(self.projects_frame, relief=tk.RAISED, borderwidth=1)
-        item_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Project info
-        info_frame = tk.Frame(item_frame)
-        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Project name
-        name = project_data.get('name', filename.replace('.vmp', ''))
-        name_label = tk.Label(info_frame, text=name, font=("Arial", 14, "bold"))
-        name_label.pack(anchor=tk.W)
-        
-        # Creation date
-        created = project_data.get('created', 'Unknown')
-        date_label = tk.Label(info_frame, text=f"Created: {created}", font=("Arial", 10), fg='gray')
-        date_label.pack(anchor=tk.W)
-        
-        # Page count
-        pages = project_data.get('pages', [])
-        pages_label = tk.Label(info_frame, text=f"Pages: {len(pages)}", font=("Arial", 10), fg='gray')
-        pages_label.pack(anchor=tk.W)
+    def apply_project_delta(self, delta):
+        """Update only the rows for projects that were added, removed or modified."""
+        if delta.initial or not self.projects:
+            self.projects = {p['filename']: p for p in self.project_index.summaries()}
+            self.populate_project_tree()
+            return
+        if not delta:
+            return
         
-        # Buttons frame
-        buttons_frame = tk.Frame(item_frame)
-        buttons_frame.pack(side=tk.RIGHT, padx=10, pady=10)
+        changed = []
+        for filename in delta.removed + delta.modified:
+            self.projects.pop(filename, None)
+            if self.project_tree.exists(filename):
+                self.project_tree.delete(filename)
+        for filename in delta.added + delta.modified:
+            summary = self.project_index.summary(filename)
+            if summary is not None:
+                self.projects[filename] = summary
+                changed.append(filename)
         
-        # Open button
-        open_btn = tk.Button(buttons_frame, text="Open", 
-                            command=lambda f=filename: self.open_project(f),
-                            bg='#2ecc71', fg='white', padx=15, pady=5)
-        open_btn.pack(pady=2)
+        # Unchanged rows are already in order, so inserting the changed ones
+        # at their final positions in ascending order keeps the whole list sorted
+        order = sorted(self.projects.values(), key=self.project_sort_key, reverse=self.sort_reverse)
+        position = {p['filename']: i for i, p in enumerate(order)}
+        for filename in sorted(changed, key=position.get):
+            project = self.projects[filename]
+            self.project_tree.insert("", position[filename], iid=filename,
+                                     values=(project['name'], project['created'], project['page_count']))
+        self.update_empty_state()
+    
+    def project_sort_key(self, project):
+        if self.sort_column == "name":
+            return (project['name'].lower(), project['filename'])
+        if self.sort_column == "created":
+            created = project['created'] if project['created'] != 'Unknown' else ''
+            return (created, project['filename'])
+        if self.sort_column == "pages":
+            return (project['page_count'], project['filename'])
+        return project['filename']
+    
+    def sort_projects_by(self, column):
+        """Sort by a column from the in-memory summaries; clicking the same column again reverses."""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = column != "name"
+        for col, heading in (("name", "Name"), ("created", "Created"), ("pages", "Pages")):
+            arrow = (" \u25bc" if self.sort_reverse else " \u25b2") if col == column else ""
+            self.project_tree.heading(col, text=heading + arrow)
+        self.populate_project_tree()
+    
+    def populate_project_tree(self):
+        """Fill the tree from self.projects in the current sort order, keeping the selection."""
+        selection = self.project_tree.selection()
+        self.project_tree.delete(*self.project_tree.get_children())
         
-        # Export PDF button
-        export_btn = tk.Button(buttons_frame, text="Export PDF", 
-                              command=lambda f=filename: self.export_project_pdf(f),
-                              bg='#e74c3c', fg='white', padx=15, pady=5)
-        export_btn.pack(pady=2)
+        for project in sorted(self.projects.values(), key=self.project_sort_key, reverse=self.sort_reverse):
+            self.project_tree.insert("", tk.END, iid=project['filename'],
+                                     values=(project['name'], project['created'], project['page_count']))
         
-        # Upload to SharePoint button
-        sharepoint_btn = tk.Button(buttons_frame, text="Upload to SharePoint", 
-                                  command=lambda f=filename: self.upload_to_sharepoint(f),
-                                  bg='#0078d4', fg='white', padx=15, pady=5)
-        sharepoint_btn.pack(pady=2)
+        selection = [iid for iid in selection if self.project_tree.exists(iid)]
+        if selection:
+            self.project_tree.selection_set(selection)
+            self.project_tree.see(selection[0])
+        
+        self.update_empty_state()
     
-
+    def update_empty_state(self):
+        if self.projects:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, rely=0.3, anchor=tk.CENTER)
+    
+    def run_on_selection(self, action):
+        """Call action(filename) for the selected project."""
+        selection = self.project_tree.selection()
+        if not selection:
+            messagebox.showinfo("No VMP Selected", "Please select a VMP from the list first.")
+            return
+        action(selection[0])
     
     def open_project(self, filename):
         """Open an existing project."""
@@ -195,26 +244,48 @@ class HomePage(tk.Frame):
     
     def export_project_pdf(self, filename):
         """Export a project directly to PDF."""
+        from tkinter import filedialog
+        from .page import load_project_pages
+        from .pdf_export import DEFAULT_EXPORT_DPI
+        from .background_export import ExportProgressDialog
         project_path = os.path.join(self.projects_dir, filename)
-        # Switch to the editor, load the project, and then export
-        editor_frame = self.controller.frames['EditorPage']
-        editor_frame.load_data(project_path)
-        editor_frame.export_to_pdf()
+        pdf_filename = os.path.splitext(filename)[0] + '.pdf'
+        save_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Documents", "*.pdf")],
+                                                 initialdir=self.projects_dir, initialfile=pdf_filename, title="Export to PDF")
+        if not save_path:
+            return
+
+        # Render straight from the file so the editor's open project is left untouched; the pages are
+        # private to this export, so they go to the background dialog without another snapshot
+        try:
+            ExportProgressDialog(self, load_project_pages(project_path), save_path, DEFAULT_EXPORT_DPI)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export PDF: {e}")
     
     def upload_to_sharepoint(self, filename):
         """Upload a VMP project file to SharePoint."""
+        from .sharepoint_uploader import upload_to_sharepoint
         project_path = os.path.join(self.projects_dir, filename)
         try:
             upload_to_sharepoint(self, project_path)
         except Exception as e:
             messagebox.showerror("Upload Error", f"Failed to upload to SharePoint: {str(e)}")
     
+    def upload_selected(self):
+        """Upload every selected project to SharePoint at once."""
+        selection = self.project_tree.selection()
+        if not selection:
+            messagebox.showinfo("No VMP Selected", "Please select one or more VMPs from the list first.")
+            return
+        from .batch_upload import batch_upload
+        batch_upload(self, [os.path.join(self.projects_dir, filename) for filename in selection])
+    
 
 
     def import_images(self):
-        """Copy selected image files to the central VMP-Images library."""
+        """Copy selected image files into the central VMP-Images library."""
         from tkinter import filedialog
-        import shutil
+        from .bulk_import import bulk_import
 
         file_paths = filedialog.askopenfilenames(
             title="Select Images to Import",
@@ -224,16 +295,24 @@ class HomePage(tk.Frame):
         if not file_paths:
             return
 
-        imported_count = 0
-        for file_path in file_paths:
-            try:
-                shutil.copy(file_path, self.images_dir)
-                imported_count += 1
-            except Exception as e:
-                print(f"Failed to import {os.path.basename(file_path)}: {e}")
-        
-        if imported_count > 0:
-            messagebox.showinfo("Import Complete", f"Successfully imported {imported_count} image(s).")
+        bulk_import(self, self.image_store, file_paths, on_complete=self.on_import_complete)
+
+    def import_image_folder(self):
+        """Copy every image in a folder and its subfolders into the library."""
+        from tkinter import filedialog
+        from .bulk_import import bulk_import
+
+        folder = filedialog.askdirectory(title="Select Folder of Images to Import")
+        if not folder:
+            return
+
+        bulk_import(self, self.image_store, [folder], on_complete=self.on_import_complete)
+
+    def on_import_complete(self, counts):
+        """Show newly imported images in the editor gallery right away."""
+        editor_frame = self.controller.frames.get("EditorPage")
+        if counts['imported'] and editor_frame is not None:
+            editor_frame.load_gallery_images()
     
     def save_project(self, project_data, name=None):
         """Save a project to the projects directory."""
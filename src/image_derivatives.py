@@ -0,0 +1,81 @@
+"""
+Export-sized image derivatives for PDF output.
+Images are downsampled to the pixel size they actually occupy on the page at a
+target DPI and recompressed. Derivatives are cached on disk, so repeat exports
+reuse them.
+"""
+
+import hashlib
+import os
+import tempfile
+from PIL import Image
+
+from . import tracing
+
+JPEG_QUALITY = 85
+MM_PER_INCH = 25.4
+
+def default_cache_dir():
+    return os.path.join(os.getcwd(), ".vmp-cache", "pdf-images")
+
+def has_transparency(img):
+    """True if the image has an alpha channel that is actually used (screenshots often don't)."""
+    if img.mode == 'P':
+        return 'transparency' in img.info
+    if img.mode in ('RGBA', 'LA', 'PA'):
+        return img.getchannel('A').getextrema()[0] < 255
+    return False
+
+class DerivativeCache:
+    """Creates and caches downsampled copies of images for a placement size and DPI."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    @staticmethod
+    def target_pixels(width_mm, height_mm, dpi):
+        return (max(1, round(width_mm / MM_PER_INCH * dpi)),
+                max(1, round(height_mm / MM_PER_INCH * dpi)))
+
+    def get(self, image_path, width_mm, height_mm, dpi):
+        """Returns the path to embed for image_path placed at width_mm x height_mm.
+
+        The original is returned when it is already no larger than the target.
+        """
+        path = os.path.abspath(image_path)
+        st = os.stat(path)
+        target_w, target_h = self.target_pixels(width_mm, height_mm, dpi)
+
+        key = f"{path}|{st.st_size}|{st.st_mtime_ns}|{target_w}x{target_h}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        for ext in ('.jpg', '.png'):
+            cached = os.path.join(self.cache_dir, digest + ext)
+            if os.path.exists(cached):
+                return cached
+
+        with Image.open(path) as img:
+            if img.width <= target_w and img.height <= target_h:
+                return image_path
+            tracing.count("images_decoded")
+            if img.format == 'JPEG':
+                img.draft('RGB', (target_w, target_h))
+            img.thumbnail((target_w, target_h), Image.LANCZOS)
+            if has_transparency(img):
+                ext, save_args = '.png', {'format': 'PNG'}
+            else:
+                img = img.convert('L' if img.mode in ('L', 'LA', '1') else 'RGB')
+                ext, save_args = '.jpg', {'format': 'JPEG', 'quality': JPEG_QUALITY, 'optimize': True}
+
+            # Write to a temporary name first so concurrent exports never see a partial file
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=ext)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    img.save(f, **save_args)
+                cached = os.path.join(self.cache_dir, digest + ext)
+                os.replace(tmp_path, cached)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return cached
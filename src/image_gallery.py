@@ -0,0 +1,278 @@
+"""
+Virtualized image gallery for the editor.
+Only rows in or near the viewport get a Tk label, labels are recycled while
+scrolling, and the number of live PhotoImages is capped, so memory stays flat
+no matter how many images are in the library. Thumbnails are decoded on a
+worker pool and handed back to Tk through after(), so the gallery is usable
+while it fills in.
+"""
+
+import bisect
+import os
+import queue
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import ImageTk
+
+ROW_HEIGHT = 184  # 150px thumbnail + name + border and padding
+CAPTION_CHARS = 24
+DEFAULT_MAX_LIVE_IMAGES = 120  # Upper bound on thumbnails kept as live Tk images
+OVERSCAN_ROWS = 3
+DECODE_WORKERS = min(4, os.cpu_count() or 1)
+POLL_INTERVAL_MS = 30
+MAX_RESULTS_PER_POLL = 16
+
+class ImageGallery(tk.Frame):
+    """Scrollable single-column gallery that renders only the visible rows."""
+
+    def __init__(self, parent, load_thumbnail, on_select=None, max_live_images=DEFAULT_MAX_LIVE_IMAGES,
+                 row_height=ROW_HEIGHT, overscan_rows=OVERSCAN_ROWS, on_thumbnails_loaded=None,
+                 decode_workers=DECODE_WORKERS, names_for=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.load_thumbnail = load_thumbnail
+        self.names_for = names_for  # image path -> names to show under its thumbnail
+        self.on_select = on_select
+        self.on_thumbnails_loaded = on_thumbnails_loaded
+        self.max_live_images = max_live_images
+        self.row_height = row_height
+        self.overscan_rows = overscan_rows
+
+        self.image_paths = []
+        self.path_set = frozenset()
+        self.selected_path = None
+        self.visible_rows = {}  # row index -> (canvas window id, label)
+        self.free_rows = []  # recycled (canvas window id, label) pairs
+        self.photos = OrderedDict()  # image path -> PhotoImage, least recently used first
+        self.failed_paths = set()
+
+        # Background decoding: workers put (path, image, error) on results, Tk drains it via after()
+        self.executor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="thumbnail")
+        self.results = queue.Queue()
+        self.pending_paths = set()
+        self.wanted_paths = frozenset()
+        self.poll_job = None
+
+        self.canvas = tk.Canvas(self, bg='#ecf0f1', highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self.update_visible_rows())
+        self.bind_mousewheel(self.canvas)
+
+    def destroy(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.poll_job is not None:
+            self.after_cancel(self.poll_job)
+            self.poll_job = None
+        super().destroy()
+
+    def bind_mousewheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-e.delta / 120) or (-1 if e.delta > 0 else 1), "units"))
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def on_scroll(self, first, last):
+        """Keeps the scrollbar in sync and re-renders the rows that came into view."""
+        self.scrollbar.set(first, last)
+        self.update_visible_rows()
+
+    def set_images(self, image_paths):
+        """Replaces the gallery contents with the given image paths."""
+        self.image_paths = list(image_paths)
+        self.path_set = frozenset(self.image_paths)
+        for path in [p for p in self.photos if p not in self.path_set]:
+            del self.photos[path]
+        self.failed_paths &= self.path_set
+        if self.selected_path not in self.path_set:
+            self.selected_path = None
+        self.rerender_rows()
+
+    def apply_changes(self, added=(), removed=(), modified=()):
+        """Applies a directory delta without reloading unchanged images. Keeps paths sorted."""
+        removed = set(removed)
+        paths = [p for p in self.image_paths if p not in removed]
+        for path in added:
+            bisect.insort(paths, path)
+        for path in list(removed) + list(modified):
+            self.photos.pop(path, None)
+            self.failed_paths.discard(path)
+
+        self.image_paths = paths
+        self.path_set = frozenset(paths)
+        if self.selected_path in removed:
+            self.selected_path = None
+        self.rerender_rows()
+
+    def rerender_rows(self):
+        """Recycles the on-screen labels after the row layout changed."""
+        for row in list(self.visible_rows):
+            self.release_row(row)
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.image_paths) * self.row_height),
+                              yscrollincrement=self.row_height // 4)
+        self.update_visible_rows()
+
+    def select(self, image_path):
+        """Highlights image_path without notifying on_select."""
+        self.selected_path = image_path
+        for row, (_, label) in self.visible_rows.items():
+            self.style_label(label, self.image_paths[row])
+
+    def visible_range(self):
+        """Returns the (first, last) rows that should currently have widgets."""
+        if not self.image_paths:
+            return 0, -1
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height) - self.overscan_rows)
+        last = min(len(self.image_paths) - 1, int(bottom // self.row_height) + self.overscan_rows)
+        return first, last
+
+    def update_visible_rows(self):
+        """Creates or recycles labels so that exactly the visible rows are rendered."""
+        first, last = self.visible_range()
+        for row in [r for r in self.visible_rows if r < first or r > last]:
+            self.release_row(row)
+
+        # Decodes for rows that scrolled away before a worker reached them are skipped
+        self.wanted_paths = frozenset(self.image_paths[first:last + 1])
+
+        center_x = max(self.canvas.winfo_width(), 1) // 2
+        for row in range(first, last + 1):
+            if row in self.visible_rows:
+                window_id, _ = self.visible_rows[row]
+                self.canvas.coords(window_id, center_x, row * self.row_height + self.row_height // 2)
+            else:
+                self.acquire_row(row, center_x)
+
+    def acquire_row(self, row, center_x):
+        """Shows row using a recycled label if one is free."""
+        y = row * self.row_height + self.row_height // 2
+        if self.free_rows:
+            window_id, label = self.free_rows.pop()
+            self.canvas.coords(window_id, center_x, y)
+            self.canvas.itemconfigure(window_id, state='normal')
+        else:
+            label = tk.Label(self.canvas, bg='#ecf0f1', relief=tk.RAISED, borderwidth=2)
+            label.bind("<Button-1>", lambda e, l=label: self.on_label_click(l))
+            self.bind_mousewheel(label)
+            window_id = self.canvas.create_window(center_x, y, window=label, anchor="center")
+
+        path = self.image_paths[row]
+        label.image_path = path
+        self.visible_rows[row] = (window_id, label)
+        self.show_thumbnail(label, path)
+
+    def release_row(self, row):
+        """Hides a row's label and returns it to the free pool."""
+        window_id, label = self.visible_rows.pop(row)
+        self.canvas.itemconfigure(window_id, state='hidden')
+        label.config(image="")
+        label.image = None
+        label.image_path = None
+        self.free_rows.append((window_id, label))
+        self.trim_photos()
+
+    def show_thumbnail(self, label, image_path):
+        """Puts the thumbnail on label, or a placeholder while it is being decoded."""
+        photo = self.photos.get(image_path)
+        if photo is not None:
+            self.photos.move_to_end(image_path)
+            label.config(image=photo, text=self.caption(image_path), compound=tk.TOP, width=0, height=0)
+        elif image_path in self.failed_paths:
+            label.config(image="", text="Invalid Image", width=18, height=8)
+        else:
+            label.config(image="", text="Loading...", width=18, height=8)
+            self.request_thumbnail(image_path)
+        label.image = photo
+        self.style_label(label, image_path)
+
+    def caption(self, image_path):
+        """Returns the name shown under a thumbnail: the first original name, or the filename."""
+        names = self.names_for(image_path) if self.names_for else []
+        if not names:
+            return os.path.basename(image_path)
+        caption = names[0]
+        if len(caption) > CAPTION_CHARS:
+            caption = caption[:CAPTION_CHARS - 3] + "..."
+        return caption + (f" (+{len(names) - 1})" if len(names) > 1 else "")
+
+    def request_thumbnail(self, image_path):
+        if image_path in self.pending_paths:
+            return
+        self.pending_paths.add(image_path)
+        self.executor.submit(self.decode_thumbnail, image_path)
+        if self.poll_job is None:
+            self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def decode_thumbnail(self, image_path):
+        """Runs on a worker thread; must not touch Tk."""
+        if image_path not in self.wanted_paths:
+            self.results.put((image_path, None, None))
+            return
+        try:
+            self.results.put((image_path, self.load_thumbnail(image_path), None))
+        except Exception as e:
+            self.results.put((image_path, None, e))
+
+    def poll_results(self):
+        """Moves finished thumbnails onto their labels, a few per tick to keep the UI responsive."""
+        self.poll_job = None
+        loaded = False
+        for _ in range(MAX_RESULTS_PER_POLL):
+            try:
+                image_path, image, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_paths.discard(image_path)
+            if image_path not in self.path_set:
+                continue
+            if error is not None:
+                print(f"Error loading gallery image {image_path}: {error}")
+                self.failed_paths.add(image_path)
+            elif image is not None:
+                self.photos[image_path] = ImageTk.PhotoImage(image)
+                loaded = True
+            else:
+                continue  # Skipped because it scrolled out of view
+            for _, label in self.visible_rows.values():
+                if label.image_path == image_path:
+                    self.show_thumbnail(label, image_path)
+            self.trim_photos()
+
+        # Rows that were skipped while off screen may be back in view now
+        for _, label in self.visible_rows.values():
+            if label.image is None and label.image_path not in self.failed_paths:
+                self.request_thumbnail(label.image_path)
+
+        if self.pending_paths and self.poll_job is None:
+            self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_results)
+        if loaded and self.on_thumbnails_loaded:
+            self.on_thumbnails_loaded()
+
+    def trim_photos(self):
+        """Drops least recently used PhotoImages that are not on screen until under the cap."""
+        if len(self.photos) <= self.max_live_images:
+            return
+        on_screen = {label.image_path for _, label in self.visible_rows.values()}
+        for path in list(self.photos):
+            if len(self.photos) <= self.max_live_images:
+                break
+            if path not in on_screen:
+                del self.photos[path]
+
+    def style_label(self, label, image_path):
+        if image_path is not None and image_path == self.selected_path:
+            label.config(bg='#3498db', relief=tk.SUNKEN)
+        else:
+            label.config(bg='#ecf0f1', relief=tk.RAISED)
+
+    def on_label_click(self, label):
+        if label.image_path is None:
+            return
+        self.select(label.image_path)
+        if self.on_select:
+            self.on_select(label.image_path, label)
@@ -0,0 +1,186 @@
+"""
+Content-addressed image library.
+Imported images are stored in VMP-Images under the SHA-256 of their content,
+so importing the same screenshot twice stores it once. Images already in the
+folder under other names are indexed too, so importing them again is
+recognised as a duplicate. An alias table keeps the original filenames, which
+the editor's gallery shows, and remembers already-hashed source files, which
+makes repeat imports close to free.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+HASH_CHUNK_SIZE = 1024 * 1024
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def hash_file(path):
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class CopyMismatch(OSError):
+    """Raised when an image copied into the library differs from its source."""
+
+class ImageStore:
+    """Stores image files by content hash with a name-alias table."""
+
+    ALIAS_FILE = ".aliases.json"
+
+    def __init__(self, images_dir):
+        self.images_dir = images_dir
+        self.alias_path = os.path.join(images_dir, self.ALIAS_FILE)
+        self.objects = {}  # content hash -> {'file': stored filename, 'names': [original filenames]}
+        self.sources = {}  # absolute source path -> {'size', 'mtime_ns', 'hash'}
+        self.dirty = False
+        self.lock = threading.Lock()
+        os.makedirs(images_dir, exist_ok=True)
+        self.load()
+        self.index_existing()
+
+    def load(self):
+        try:
+            with open(self.alias_path, 'r') as f:
+                data = json.load(f)
+            self.objects = data.get('objects', {})
+            self.sources = data.get('sources', {})
+        except (OSError, ValueError):
+            self.objects = {}
+            self.sources = {}
+
+    def index_existing(self):
+        """Adds images already in the library folder, e.g. screenshots saved under their own names, to the table.
+
+        Their hashes are remembered like import sources, so only new or changed files are read again.
+        """
+        with self.lock:
+            stored_files = {entry['file'] for entry in self.objects.values()}
+        with os.scandir(self.images_dir) as it:
+            names = [entry.name for entry in it if entry.is_file() and not entry.name.startswith('.')
+                     and entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.name not in stored_files]
+        for name in names:
+            try:
+                content_hash = self.source_hash(os.path.join(self.images_dir, name))
+            except OSError:
+                continue  # Removed while we were scanning
+            with self.lock:
+                if content_hash not in self.objects:
+                    self.objects[content_hash] = {'file': name, 'names': [name]}
+                    self.dirty = True
+        try:
+            self.save()
+        except OSError as e:
+            print(f"Could not save image aliases: {e}")
+
+    def save(self):
+        """Writes the alias table back to disk if anything changed."""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps({'objects': self.objects, 'sources': self.sources}, indent=1)
+            self.dirty = False
+        tmp_path = self.alias_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.alias_path)
+
+    def object_path(self, content_hash):
+        """Returns the stored path for a content hash, or None if it is not in the library."""
+        with self.lock:
+            entry = self.objects.get(content_hash)
+        if entry is None:
+            return None
+        path = os.path.join(self.images_dir, entry['file'])
+        return path if os.path.exists(path) else None
+
+    def names_for(self, stored_path):
+        """Returns the original filenames a stored image was imported as."""
+        filename = os.path.basename(stored_path)
+        content_hash = os.path.splitext(filename)[0]
+        with self.lock:
+            entry = self.objects.get(content_hash)
+            if entry is None:
+                # Indexed under its own name rather than its hash
+                known = self.sources.get(os.path.abspath(stored_path))
+                entry = self.objects.get(known['hash']) if known else None
+            return list(entry['names']) if entry else [filename]
+
+    def source_hash(self, source_path):
+        """Hashes a source file, reusing the remembered hash if it has not changed since."""
+        key = os.path.abspath(source_path)
+        st = os.stat(key)
+        with self.lock:
+            known = self.sources.get(key)
+        if known and known['size'] == st.st_size and known['mtime_ns'] == st.st_mtime_ns:
+            return known['hash']
+
+        content_hash = hash_file(key)
+        with self.lock:
+            self.sources[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': content_hash}
+            self.dirty = True
+        return content_hash
+
+    def add_alias(self, content_hash, stored_file, original_name):
+        """Records original_name for a stored object. Returns True if the object was new."""
+        with self.lock:
+            created = content_hash not in self.objects
+            entry = self.objects.setdefault(content_hash, {'file': stored_file, 'names': []})
+            entry['file'] = stored_file
+            if original_name not in entry['names']:
+                entry['names'].append(original_name)
+            self.dirty = True
+            return created
+
+    def import_file(self, source_path, content_hash=None):
+        """Adds a file to the library. Returns (stored path, True if it was already stored)."""
+        original_name = os.path.basename(source_path)
+        if content_hash is None:
+            content_hash = self.source_hash(source_path)
+
+        existing = self.object_path(content_hash)
+        if existing:
+            self.add_alias(content_hash, os.path.basename(existing), original_name)
+            return existing, True
+
+        ext = os.path.splitext(original_name)[1].lower()
+        stored_file = content_hash + ext
+        stored_path = os.path.join(self.images_dir, stored_file)
+        self.copy_into_library(source_path, stored_path, content_hash)
+        # Another thread may have stored identical content meanwhile; the copies are interchangeable
+        created = self.add_alias(content_hash, stored_file, original_name)
+        return stored_path, not created
+
+    def copy_into_library(self, source_path, stored_path, content_hash=None):
+        """Copies via a temporary name so the library never holds a partial image.
+
+        With content_hash, the copy is read back and must match it before it is moved into place.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.images_dir, prefix=".import-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(source_path, 'rb') as src:
+                for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b''):
+                    dst.write(chunk)
+            if content_hash is not None and hash_file(tmp_path) != content_hash:
+                raise CopyMismatch(f"Copy of {os.path.basename(source_path)} did not match the source checksum")
+            os.replace(tmp_path, stored_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def get_image_store(images_dir):
+    """Returns the shared ImageStore for images_dir, so imports and the gallery see the same alias table."""
+    key = os.path.abspath(images_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ImageStore(images_dir)
+        return _stores[key]
@@ -1,64 +1,25 @@
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
-import json
-from .sharepoint_uploader import upload_to_sharepoint
-
-class Page:
-    def __init__(self, page_type='standard', title="", bullets=None, image_path1=None, image_path2=None, full_image_path=None, 
-                 created_by="", date="", version="", approved_by="", approval_date="",
-                 safety_warning=False, quality_check=False):
-        self.page_type = page_type
-        self.title = title
-        self.bullets = bullets if bullets is not None else ["", "", ""]
-        self.image_path1 = image_path1
-        self.image_path2 = image_path2
-        self.full_image_path = full_image_path
-        # New title page fields
-        self.created_by = created_by
-        self.date = date
-        self.version = version
-        self.approved_by = approved_by
-        self.approval_date = approval_date
-        # New warning/check fields
-        self.safety_warning = safety_warning
-        self.quality_check = quality_check
-
-    def to_dict(self):
-        return {
-            'page_type': self.page_type,
-            'title': self.title,
-            'bullets': self.bullets,
-            'image_path1': self.image_path1,
-            'image_path2': self.image_path2,
-            'full_image_path': self.full_image_path,
-            'created_by': self.created_by,
-            'date': self.date,
-            'version': self.version,
-            'approved_by': self.approved_by,
-            'approval_date': self.approval_date,
-            'safety_warning': self.safety_warning,
-            'quality_check': self.quality_check
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        return cls(
-            page_type=data.get('page_type', 'standard'),
-            title=data.get('title', ''),
-            bullets=data.get('bullets', ["", "", ""]),
-            image_path1=data.get('image_path1'),
-            image_path2=data.get('image_path2'),
-            full_image_path=data.get('full_image_path'),
-            created_by=data.get('created_by', ''),
-            date=data.get('date', ''),
-            version=data.get('version', ''),
-            approved_by=data.get('approved_by', ''),
-            approval_date=data.get('approval_date', ''),
-            safety_warning=data.get('safety_warning', False),
-            quality_check=data.get('quality_check', False)
-        )
+from PIL import ImageTk
+from .page import Page, LazyPageList, load_project_pages, pages_from_data, page_dicts, copy_page_dict, write_project_data
+from .pdf_export import DEFAULT_EXPORT_DPI
+from .background_export import export_in_background
+from .thumbnail_cache import ThumbnailCache
+from .image_gallery import ImageGallery, DEFAULT_MAX_LIVE_IMAGES
+from .image_store import get_image_store
+from .dir_snapshot import DirectorySnapshot, DirectoryPoller
+from .preview_cache import PreviewCache, DEFAULT_MAX_BYTES as PREVIEW_CACHE_MAX_BYTES
+from .vmpz import is_bundle, write_bundle, VmpzBundle
+from .autosave import ProjectJournal, journal_path_for, recover_pages
+from .undo_history import UndoHistory
+from .tracing import traced
+
+# How often VMP-Images is checked for images added outside the app
+GALLERY_POLL_INTERVAL_MS = 5000
+AUTOSAVE_INTERVAL_MS = 10000
+UNDO_HISTORY_MAX_BYTES = 4 * 1024 * 1024
+PAGE_LOAD_BATCH = 200  # Pages built per idle callback after a large project opens
 
 class EditorPage(tk.Frame):
     """Editor page for VMP Tool - handles editing and page navigation."""
@@ -67,7 +28,13 @@ class EditorPage(tk.Frame):
         super().__init__(parent)
         self.controller = controller
         self.images_dir = os.path.join(os.getcwd(), "VMP-Images")
+        self.thumbnail_cache = ThumbnailCache()
+        self.preview_cache = PreviewCache(PREVIEW_CACHE_MAX_BYTES)
+        self.image_snapshot = DirectorySnapshot(self.images_dir, ('png', 'jpg', 'jpeg', 'gif'))
         self.project_file = None
+        self.bundle = None  # Open VmpzBundle when editing a .vmpz project
+        self.journal = None  # Autosave journal for the open project file
+        self.history = UndoHistory(UNDO_HISTORY_MAX_BYTES)
         # Create the initial page and apply a workaround for initialization issues
         page = Page('title')
         if not hasattr(page, 'created_by'):
@@ -80,7 +47,17 @@ class EditorPage(tk.Frame):
         self.current_page_index = 0
         self.selected_gallery_image_path = None
 
-        # Initialize UI elements to None
+        # Initialize UI elements to None; page layouts are built on first use and then reused
+        self.page_layouts = {}
+        self.active_layout = None
+        self.layout_padding = {
+            'title': {'padx': 20, 'pady': 10},
+            'standard': {},
+            'full_image': {'padx': 10, 'pady': 10},
+        }
+        self.bullet_texts = []
+        self.image_labels = []
+        self.full_image_label = None
         self.title_text = None
         self.created_by_entry = None
         self.date_entry = None
@@ -93,15 +70,21 @@ class EditorPage(tk.Frame):
 
         self.setup_ui()
         self.show_page() # Show initial blank page
+        self.after(AUTOSAVE_INTERVAL_MS, self.autosave)
+        self.controller.bind("<Control-z>", lambda event: self.on_history_key(self.undo))
+        self.controller.bind("<Control-y>", lambda event: self.on_history_key(self.redo))
 
     def load_data(self, project_file=None):
         """Loads a project or resets to a new one."""
         if project_file and os.path.exists(project_file):
             self.load_project(project_file)
         else:
+            self.close_bundle()
+            self.stop_journal()
             self.project_file = None
             self.pages = [Page('title')]  # Start with a title page
             self.current_page_index = 0
+            self.history.clear()
             self.show_page()
         self.load_gallery_images()
 
@@ -130,6 +113,9 @@ class EditorPage(tk.Frame):
         self.content_container = tk.Frame(main_frame, bg='#ecf0f1')
         self.content_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        self.safety_indicator = tk.Label(self.warnings_container, text="SAFETY WARNING", bg="#f1c40f", fg="#000000", font=("Arial", 10, "bold"))
+        self.quality_indicator = tk.Label(self.warnings_container, text="QUALITY CHECK", bg="#3498db", fg="#ffffff", font=("Arial", 10, "bold"))
+
         nav_frame = tk.Frame(editor_pane, bg='#bdc3c7')
         nav_frame.grid(row=1, column=0, sticky='ew')
         nav_frame.grid_columnconfigure(1, weight=1)
@@ -137,9 +123,15 @@ class EditorPage(tk.Frame):
         left_buttons = tk.Frame(nav_frame, bg='#bdc3c7')
         left_buttons.grid(row=0, column=0, padx=10, pady=5)
 
-        self.home_btn = tk.Button(left_buttons, text="Home", command=lambda: self.controller.show_frame("HomePage"))
+        self.home_btn = tk.Button(left_buttons, text="Home", command=self.go_home)
         self.home_btn.pack(side=tk.LEFT, padx=5)
 
+        self.undo_btn = tk.Button(left_buttons, text="Undo", command=self.undo)
+        self.undo_btn.pack(side=tk.LEFT, padx=5)
+
+        self.redo_btn = tk.Button(left_buttons, text="Redo", command=self.redo)
+        self.redo_btn.pack(side=tk.LEFT, padx=5)
+
         center_buttons = tk.Frame(nav_frame, bg='#bdc3c7')
         center_buttons.grid(row=0, column=1, pady=5)
 
@@ -185,8 +177,20 @@ class EditorPage(tk.Frame):
         self.save_btn = tk.Button(right_buttons, text="Save Project", command=self.save_project)
         self.save_btn.pack(side=tk.LEFT, padx=5)
 
-        self.export_btn = tk.Button(right_buttons, text="Export to PDF", command=self.export_to_pdf)
-        self.export_btn.pack(side=tk.LEFT, padx=5)
+        # Export with image resolution selection
+        export_frame = tk.Frame(right_buttons, bg='#bdc3c7')
+        export_frame.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(export_frame, text="Image DPI:", bg='#bdc3c7', font=("Arial", 8)).pack(side=tk.TOP)
+
+        self.export_dpi_var = tk.StringVar(value=str(DEFAULT_EXPORT_DPI))
+        self.export_dpi_combo = ttk.Combobox(export_frame, textvariable=self.export_dpi_var,
+                                             values=["Original", "300", "200", "150", "100"],
+                                             state="readonly", width=8, font=("Arial", 8))
+        self.export_dpi_combo.pack(side=tk.TOP, pady=(0, 2))
+
+        self.export_btn = tk.Button(export_frame, text="Export to PDF", command=self.export_to_pdf, font=("Arial", 8))
+        self.export_btn.pack(side=tk.TOP)
         
         self.sharepoint_btn = tk.Button(right_buttons, text="Upload to SharePoint", command=self.upload_to_sharepoint,
                                        bg='#0078d4', fg='white')
@@ -200,50 +204,56 @@ class EditorPage(tk.Frame):
         gallery_label = tk.Label(parent_frame, text="Image Gallery", font=("Arial", 12, "bold"), bg='#bdc3c7')
         gallery_label.pack(pady=10)
 
-        canvas = tk.Canvas(parent_frame, bg='#ecf0f1')
-        scrollbar = tk.Scrollbar(parent_frame, orient="vertical", command=canvas.yview)
-        self.scrollable_frame = tk.Frame(canvas, bg='#ecf0f1')
-
-        self.scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))) 
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.gallery = ImageGallery(parent_frame, load_thumbnail=self.thumbnail_cache.get_thumbnail,
+                                    on_select=self.select_gallery_image,
+                                    on_thumbnails_loaded=self.schedule_thumbnail_cache_save,
+                                    max_live_images=DEFAULT_MAX_LIVE_IMAGES,
+                                    names_for=get_image_store(self.images_dir).names_for, bg='#ecf0f1')
+        self.gallery.pack(fill="both", expand=True)
+        self.thumbnail_cache_save_job = None
 
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        self.load_gallery_images()
+        # load_data fills the gallery when the editor is first shown
+        self.gallery_poller = DirectoryPoller(self, self.image_snapshot.scan, self.apply_gallery_delta,
+                                              interval_ms=GALLERY_POLL_INTERVAL_MS)
+        self.gallery_poller.start()
 
+    @traced("load_gallery_images")
     def load_gallery_images(self):
         """Loads images from the VMP-Images directory into the gallery."""
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
         if not os.path.exists(self.images_dir):
             os.makedirs(self.images_dir)
 
-        image_files = [f for f in os.listdir(self.images_dir) if f.lower().endswith(('png', 'jpg', 'jpeg', 'gif'))]
-        
-        for image_name in image_files:
-            image_path = os.path.join(self.images_dir, image_name)
-            try:
-                img = Image.open(image_path)
-                img.thumbnail((150, 150))
-                photo = ImageTk.PhotoImage(img)
-
-                label = tk.Label(self.scrollable_frame, image=photo, bg='#ecf0f1', relief=tk.RAISED, borderwidth=2)
-                label.image = photo
-                label.pack(pady=5, padx=5)
-                label.bind("<Button-1>", lambda e, p=image_path, l=label: self.select_gallery_image(p, l))
-            except Exception as e:
-                print(f"Error loading gallery image {image_name}: {e}")
+        self.apply_gallery_delta(self.image_snapshot.scan())
+
+    def apply_gallery_delta(self, delta):
+        """Updates the gallery with only the images added, removed or modified since the last scan."""
+        if delta.initial:
+            # Only the rows in view are decoded; the rest load as they scroll in
+            self.gallery.set_images(self.image_snapshot.paths())
+        elif delta:
+            to_paths = lambda names: [os.path.join(self.images_dir, name) for name in names]
+            self.gallery.apply_changes(to_paths(delta.added), to_paths(delta.removed), to_paths(delta.modified))
+
+        if delta.initial or delta.removed:
+            # Drop thumbnails of deleted images
+            self.thumbnail_cache.prune(self.image_snapshot.paths())
+            self.schedule_thumbnail_cache_save()
+
+    def schedule_thumbnail_cache_save(self):
+        """Persists new thumbnails shortly after a burst of gallery loads."""
+        if self.thumbnail_cache_save_job is None:
+            self.thumbnail_cache_save_job = self.after(2000, self.save_thumbnail_cache)
+
+    def save_thumbnail_cache(self):
+        self.thumbnail_cache_save_job = None
+        try:
+            self.thumbnail_cache.save()
+        except OSError as e:
+            print(f"Could not save thumbnail cache: {e}")
 
-    def select_gallery_image(self, image_path, clicked_label):
+    def select_gallery_image(self, image_path, clicked_label=None):
         """Highlights the selected image in the gallery."""
-        for widget in self.scrollable_frame.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.config(bg='#ecf0f1', relief=tk.RAISED)
-        
-        clicked_label.config(bg='#3498db', relief=tk.SUNKEN)
+        self.gallery.select(image_path)
         self.selected_gallery_image_path = image_path
 
     def assign_image_to_placeholder(self, image_index):
@@ -252,6 +262,7 @@ class EditorPage(tk.Frame):
             messagebox.showwarning("No Image Selected", "Please select an image from the gallery first.")
             return
 
+        self.save_current_page_data()
         page = self.pages[self.current_page_index]
         if image_index == 0:
             page.image_path1 = self.selected_gallery_image_path
@@ -259,53 +270,60 @@ class EditorPage(tk.Frame):
             page.image_path2 = self.selected_gallery_image_path
         elif image_index == 'full':
             page.full_image_path = self.selected_gallery_image_path
+        self.history.checkpoint(self.pages)
         
         self.show_page()
 
+    @traced("show_page")
     def show_page(self):
         """Displays the current page's content based on page type."""
-        # Clear previous page's content and warnings first
-        for widget in self.content_container.winfo_children():
-            widget.destroy()
-        for widget in self.warnings_container.winfo_children():
-            widget.destroy()
-
         self.update_navigation()
 
         page = self.pages[self.current_page_index]
-        
-        # Reset UI references
-        self.bullet_texts = []
-        self.title_text = None
-        self.full_image_label = None
-        self.created_by_entry = None
-        self.date_entry = None
-        self.version_entry = None
-        self.approved_by_entry = None
-        self.approval_date_entry = None
+        self.history.watch(self.current_page_index, page)
 
         self.safety_var.set(page.safety_warning)
         self.quality_var.set(page.quality_check)
         self.show_warning_indicators(page)
 
+        # Each page type has one persistent layout; switching pages only swaps its content
+        layout = self.get_page_layout(page.page_type)
+        if layout is not self.active_layout:
+            if self.active_layout is not None:
+                self.active_layout.pack_forget()
+            if layout is not None:
+                layout.pack(fill=tk.BOTH, expand=True, **self.layout_padding[page.page_type])
+            self.active_layout = layout
+
         if page.page_type == 'title':
             self.show_title_page(page)
         elif page.page_type == 'standard':
             self.show_standard_page(page)
         elif page.page_type == 'full_image':
             self.show_full_image_page(page)
-    
-    def show_title_page(self, page):
-        """Display title page layout with metadata fields."""
+
+    def get_page_layout(self, page_type):
+        """Returns the widget set for a page type, building it the first time it is needed."""
+        if page_type not in self.page_layouts:
+            builders = {
+                'title': self.build_title_layout,
+                'standard': self.build_standard_layout,
+                'full_image': self.build_full_image_layout,
+            }
+            if page_type not in builders:
+                return None
+            self.page_layouts[page_type] = builders[page_type]()
+        return self.page_layouts[page_type]
+
+    def build_title_layout(self):
+        """Creates the title page widgets (title + metadata fields)."""
         container = tk.Frame(self.content_container, bg='#ecf0f1')
-        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         container.grid_columnconfigure(0, weight=1)
 
         # --- Title --- 
         title_label = tk.Label(container, text="Procedure Title", font=("Arial", 14, "bold"), bg='#ecf0f1')
         title_label.grid(row=0, column=0, sticky='w')
         self.title_text = tk.Text(container, height=3, wrap=tk.WORD, relief=tk.SUNKEN, borderwidth=1, font=("Arial", 18, "bold"))
-        self.title_text.insert(tk.END, page.title)
         self.title_text.grid(row=1, column=0, sticky='ew', pady=(0, 20))
 
         # --- Metadata Frame ---
@@ -315,95 +333,121 @@ class EditorPage(tk.Frame):
         metadata_frame.grid_columnconfigure(3, weight=1)
 
         fields = {
-            "Created by:": (0, 0, 'created_by_entry', page.created_by),
-            "Date:": (1, 0, 'date_entry', page.date),
-            "Version:": (2, 0, 'version_entry', page.version),
-            "Approved by:": (0, 2, 'approved_by_entry', page.approved_by),
-            "Approval Date:": (1, 2, 'approval_date_entry', page.approval_date)
+            "Created by:": (0, 0, 'created_by_entry'),
+            "Date:": (1, 0, 'date_entry'),
+            "Version:": (2, 0, 'version_entry'),
+            "Approved by:": (0, 2, 'approved_by_entry'),
+            "Approval Date:": (1, 2, 'approval_date_entry')
         }
 
-        for label_text, (r, c, entry_attr, value) in fields.items():
+        for label_text, (r, c, entry_attr) in fields.items():
             label = tk.Label(metadata_frame, text=label_text, font=("Arial", 10), bg='#ecf0f1')
             label.grid(row=r, column=c, sticky='w', padx=5, pady=5)
             entry = tk.Entry(metadata_frame, font=("Arial", 10))
-            entry.insert(tk.END, value)
             entry.grid(row=r, column=c + 1, sticky='ew', padx=5, pady=5)
             setattr(self, entry_attr, entry)
-    
-    def show_standard_page(self, page):
-        """Display standard page layout (3 bullets + 2 images)."""
-        left_frame = tk.Frame(self.content_container, bg='#ecf0f1')
+        return container
+
+    def build_standard_layout(self):
+        """Creates the standard page widgets (3 bullets + 2 images)."""
+        container = tk.Frame(self.content_container, bg='#ecf0f1')
+        left_frame = tk.Frame(container, bg='#ecf0f1')
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        right_frame = tk.Frame(self.content_container, bg='#ecf0f1')
+        right_frame = tk.Frame(container, bg='#ecf0f1')
         right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
         self.bullet_texts = []
         for i in range(3):
             text_widget = tk.Text(left_frame, height=8, width=50, wrap=tk.WORD, relief=tk.SUNKEN, borderwidth=1)
-            text_widget.insert(tk.END, page.bullets[i])
             text_widget.pack(pady=5, fill=tk.BOTH, expand=True)
             self.bullet_texts.append(text_widget)
 
-        self.display_image(right_frame, page.image_path1, 0)
-        self.display_image(right_frame, page.image_path2, 1)
-    
-    def show_full_image_page(self, page):
-        """Display full image page layout."""
+        self.image_labels = []
+        for i in range(2):
+            image_container = tk.Frame(right_frame, bg='#ecf0f1')
+            image_container.pack(fill=tk.BOTH, expand=True, pady=5)
+            label = tk.Label(image_container)
+            label.pack(fill=tk.BOTH, expand=True)
+            label.bind("<Button-1>", lambda e, i=i: self.assign_image_to_placeholder(i))
+            self.image_labels.append(label)
+        return container
+
+    def build_full_image_layout(self):
+        """Creates the full image page widgets."""
         image_frame = tk.Frame(self.content_container, bg='#ecf0f1')
-        image_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        self.display_full_image(image_frame, page.full_image_path)
+        self.full_image_label = tk.Label(image_frame, font=("Arial", 14))
+        self.full_image_label.pack(fill=tk.BOTH, expand=True)
+        self.full_image_label.bind("<Button-1>", lambda e: self.assign_image_to_placeholder('full'))
+        return image_frame
+
+    def show_title_page(self, page):
+        """Fill the title page layout with the page's metadata."""
+        self.title_text.delete("1.0", tk.END)
+        self.title_text.insert(tk.END, page.title)
+        for entry, value in ((self.created_by_entry, page.created_by),
+                             (self.date_entry, page.date),
+                             (self.version_entry, page.version),
+                             (self.approved_by_entry, page.approved_by),
+                             (self.approval_date_entry, page.approval_date)):
+            entry.delete(0, tk.END)
+            entry.insert(tk.END, value)
+    
+    def show_standard_page(self, page):
+        """Fill the standard page layout (3 bullets + 2 images)."""
+        for text_widget, bullet in zip(self.bullet_texts, page.bullets):
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert(tk.END, bullet)
 
-    def display_image(self, parent, image_path, index):
-        """Displays an image in a given frame or a placeholder if no image."""
-        container = tk.Frame(parent, bg='#ecf0f1')
-        container.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.display_image(self.image_labels[0], page.image_path1)
+        self.display_image(self.image_labels[1], page.image_path2)
+    
+    def show_full_image_page(self, page):
+        """Fill the full image page layout."""
+        self.display_full_image(self.full_image_label, page.full_image_path)
 
+    def display_image(self, label, image_path):
+        """Shows an image on a placeholder label, or the placeholder text if no image."""
         try:
+            image_path = self.resolve_image(image_path)
             if image_path and os.path.exists(image_path):
-                img = Image.open(image_path)
-                img.thumbnail((400, 300))
+                img = self.preview_cache.get(image_path, (400, 300))
                 photo = ImageTk.PhotoImage(img)
-
-                label = tk.Label(container, image=photo, bg="#ffffff")
-                label.image = photo
+                label.config(image=photo, text="", bg="#ffffff", relief=tk.FLAT, width=0, height=0)
             else:
-                label = tk.Label(container, text="Click to assign image", bg="#cccccc", height=15, width=40, relief=tk.GROOVE)
+                photo = None
+                label.config(image="", text="Click to assign image", bg="#cccccc", relief=tk.GROOVE, width=40, height=15)
         except Exception as e:
-            label = tk.Label(container, text="Invalid Image", bg="#ffcccc", height=15, width=40)
-
-        label.pack(fill=tk.BOTH, expand=True)
-        label.bind("<Button-1>", lambda e, i=index: self.assign_image_to_placeholder(i))
+            photo = None
+            label.config(image="", text="Invalid Image", bg="#ffcccc", relief=tk.FLAT, width=40, height=15)
+        label.image = photo
     
-    def display_full_image(self, parent, image_path):
-        """Displays a full-page image or placeholder."""
+    def display_full_image(self, label, image_path):
+        """Shows a full-page image or placeholder on the full image label."""
         try:
+            image_path = self.resolve_image(image_path)
             if image_path and os.path.exists(image_path):
-                img = Image.open(image_path)
                 # Scale to fit the container while maintaining aspect ratio
-                img.thumbnail((800, 600))
+                img = self.preview_cache.get(image_path, (800, 600))
                 photo = ImageTk.PhotoImage(img)
-                label = tk.Label(parent, image=photo, bg="#ffffff")
-                label.image = photo
+                label.config(image=photo, text="", bg="#ffffff", relief=tk.FLAT, width=0, height=0)
             else:
-                label = tk.Label(parent, text="Click to assign full page image", bg="#cccccc", 
-                                height=30, width=80, relief=tk.GROOVE, font=("Arial", 14))
+                photo = None
+                label.config(image="", text="Click to assign full page image", bg="#cccccc",
+                             relief=tk.GROOVE, width=80, height=30)
         except Exception as e:
-            label = tk.Label(parent, text="Invalid Image", bg="#ffcccc", 
-                           height=30, width=80, font=("Arial", 14))
-
-        label.pack(fill=tk.BOTH, expand=True)
-        label.bind("<Button-1>", lambda e: self.assign_image_to_placeholder('full'))
-        self.full_image_label = label
+            photo = None
+            label.config(image="", text="Invalid Image", bg="#ffcccc", relief=tk.FLAT, width=80, height=30)
+        label.image = photo
 
     def show_warning_indicators(self, page):
         """Displays colored indicators based on page flags."""
+        # Repack in a fixed order so the safety indicator always comes first
+        self.safety_indicator.pack_forget()
+        self.quality_indicator.pack_forget()
         if page.safety_warning:
-            safety_indicator = tk.Label(self.warnings_container, text="SAFETY WARNING", bg="#f1c40f", fg="#000000", font=("Arial", 10, "bold"))
-            safety_indicator.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+            self.safety_indicator.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         if page.quality_check:
-            quality_indicator = tk.Label(self.warnings_container, text="QUALITY CHECK", bg="#3498db", fg="#ffffff", font=("Arial", 10, "bold"))
-            quality_indicator.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+            self.quality_indicator.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
     def update_warnings(self):
         """Called when a warning checkbox is clicked."""
@@ -437,9 +481,11 @@ class EditorPage(tk.Frame):
         page.quality_check = self.quality_var.get()
         
         # Save standard page data
-        if hasattr(self, 'bullet_texts') and self.bullet_texts:
+        if page.page_type == 'standard' and self.bullet_texts:
             for i in range(3):
                 page.bullets[i] = self.bullet_texts[i].get("1.0", tk.END).strip()
+
+        self.history.checkpoint(self.pages)
     
 
 
@@ -449,6 +495,8 @@ class EditorPage(tk.Frame):
         self.prev_btn.config(state=tk.NORMAL if self.current_page_index > 0 else tk.DISABLED)
         self.next_btn.config(state=tk.NORMAL if self.current_page_index < len(self.pages) - 1 else tk.DISABLED)
         self.delete_page_btn.config(state=tk.NORMAL if len(self.pages) > 1 else tk.DISABLED)
+        self.undo_btn.config(state=tk.NORMAL if self.history.can_undo() else tk.DISABLED)
+        self.redo_btn.config(state=tk.NORMAL if self.history.can_redo() else tk.DISABLED)
 
     def next_page(self):
         if self.current_page_index < len(self.pages) - 1:
@@ -475,74 +523,186 @@ class EditorPage(tk.Frame):
         
         self.pages.insert(self.current_page_index + 1, Page(selected_type))
         self.current_page_index += 1
+        self.history.record_insert(self.current_page_index, self.pages[self.current_page_index])
+        self.page_inserted(self.current_page_index)
         self.show_page()
 
     def delete_page(self):
         if len(self.pages) > 1:
             if messagebox.askyesno("Delete Page", "Are you sure you want to delete this page?"):
+                self.save_current_page_data()
+                self.history.record_delete(self.current_page_index, self.pages[self.current_page_index])
                 del self.pages[self.current_page_index]
+                self.page_deleted(self.current_page_index)
                 if self.current_page_index >= len(self.pages):
                     self.current_page_index = len(self.pages) - 1
                 self.show_page()
 
+    def page_inserted(self, index):
+        self.journal_change(lambda journal: journal.insert(index, self.pages[index]))
+
+    def page_deleted(self, index):
+        self.journal_change(lambda journal: journal.delete(index))
+
+    def undo(self):
+        """Reverts the last page edit, insert or delete and shows the page it affected."""
+        self.save_current_page_data()
+        index = self.history.undo(self.pages, self.page_inserted, self.page_deleted)
+        if index is not None:
+            self.current_page_index = index
+            self.show_page()
+
+    def on_history_key(self, action):
+        # The shortcuts are bound on the window, so ignore them while another frame is shown
+        if self.controller.current_frame == "EditorPage":
+            action()
+            return "break"
+
+    def redo(self):
+        self.save_current_page_data()
+        index = self.history.redo(self.pages, self.page_inserted, self.page_deleted)
+        if index is not None:
+            self.current_page_index = index
+            self.show_page()
+
     def save_project(self):
-        """Saves the entire project to a .vmp file."""
+        """Saves the entire project to a .vmp file or .vmpz bundle."""
         self.save_current_page_data() # Ensure current page data is saved before serializing
         if not self.project_file:
-            self.project_file = filedialog.asksaveasfilename(defaultextension=".vmp", filetypes=[("VMP Files", "*.vmp")], initialdir=os.path.join(os.getcwd(), "VMP-Projects"), title="Save Project As")
+            self.project_file = filedialog.asksaveasfilename(defaultextension=".vmp", filetypes=[("VMP Files", "*.vmp"), ("VMP Bundles (with images)", "*.vmpz")], initialdir=os.path.join(os.getcwd(), "VMP-Projects"), title="Save Project As")
         if self.project_file:
             try:
-                data = {'pages': [page.to_dict() for page in self.pages]}
-                with open(self.project_file, 'w') as f:
-                    json.dump(data, f, indent=4)
+                self.write_project_file()
                 messagebox.showinfo("Success", "Project saved successfully.")
                 self.controller.frames["HomePage"].refresh_project_list()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save project: {e}")
 
+    def write_project_file(self):
+        """Serializes all pages to self.project_file."""
+        data = {'pages': page_dicts(self.pages)}
+        if is_bundle(self.project_file):
+            # Pull every image out of the open bundle before it is replaced on disk
+            if self.bundle is not None:
+                self.bundle.materialize_pages(self.pages)
+            self.close_bundle()
+            write_bundle(data, self.project_file)
+            self.bundle = VmpzBundle(self.project_file)
+        else:
+            write_project_data(self.project_file, data)
+        # Everything journaled so far is now in the project file; if writing failed, the journal is kept
+        self.stop_journal(discard=True)
+        self.journal = ProjectJournal(self.project_file, self.pages)
+
+    def stop_journal(self, discard=False):
+        if self.journal is not None:
+            if discard:
+                self.journal.discard()
+            else:
+                self.journal.close()
+            self.journal = None
+
+    def journal_change(self, change):
+        """Applies a structural change to the autosave journal, dropping the journal if it fails."""
+        if self.journal is None:
+            return
+        try:
+            change(self.journal)
+        except OSError as e:
+            print(f"Autosave disabled for this session: {e}")
+            self.stop_journal()
+
+    def autosave(self):
+        """Appends pending edits to the journal; compacts it into the project file once it grows large."""
+        try:
+            if self.journal is not None:
+                self.save_current_page_data()
+                self.journal_change(lambda journal: journal.sync(self.pages))
+                if self.journal is not None and self.journal.needs_compaction():
+                    self.write_project_file()
+        except Exception as e:
+            print(f"Autosave failed: {e}")
+        finally:
+            self.after(AUTOSAVE_INTERVAL_MS, self.autosave)
+
+    def flush_autosave(self):
+        """Folds journaled edits into the project file; called when leaving the editor or closing the app."""
+        if self.journal is None:
+            return
+        self.save_current_page_data()
+        self.journal_change(lambda journal: journal.sync(self.pages))
+        if self.journal is not None and self.journal.has_changes:
+            try:
+                self.write_project_file()
+            except Exception as e:
+                # Leave the journal in place so the edits are recovered next time
+                print(f"Failed to compact autosave journal: {e}")
+                self.stop_journal()
+        else:
+            self.stop_journal(discard=True)
+
+    def go_home(self):
+        self.flush_autosave()
+        self.controller.show_frame("HomePage")
+
+    def close_bundle(self):
+        if self.bundle is not None:
+            self.bundle.close()
+            self.bundle = None
+
+    def resolve_image(self, image_path):
+        """Returns a path that can be opened, extracting bundled images on first use."""
+        if self.bundle is not None and image_path:
+            return self.bundle.materialize(image_path)
+        return image_path
+
+    @traced("load_project")
     def load_project(self, project_file):
-        """Loads a project from a .vmp file."""
+        """Loads a project from a .vmp file or .vmpz bundle."""
         try:
-            with open(project_file, 'r') as f:
-                data = json.load(f)
-            self.pages = []
-            for page_data in data['pages']:
-                # Defensive loading: ensure new fields exist, providing defaults if not.
-                page_data.setdefault('created_by', '')
-                page_data.setdefault('date', '')
-                page_data.setdefault('version', '')
-                page_data.setdefault('approved_by', '')
-                page_data.setdefault('approval_date', '')
-                self.pages.append(Page.from_dict(page_data))
+            self.close_bundle()
+            self.stop_journal()
+            if is_bundle(project_file):
+                # Images stay in the archive until a page that shows them is opened
+                self.bundle = VmpzBundle(project_file)
+                self.pages = pages_from_data(self.bundle.read_project(), lazy=True)
+            else:
+                # Pages are built as they are shown, so large projects open on page 1 right away
+                self.pages = load_project_pages(project_file, lazy=True)
             self.project_file = project_file
+            self.history.clear()
+            self.recover_autosave()
+            if self.journal is None:
+                self.journal = ProjectJournal(project_file, self.pages)
             self.current_page_index = 0
             self.show_page()
+            self.after_idle(self.load_pending_pages, self.pages)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load project: {e}")
 
-    def export_warning_indicators_to_pdf(self, pdf, page):
-        """Draws colored warning indicators at the top of a PDF page."""
-        initial_y = pdf.get_y()
-        indicator_height = 8
-        
-        if page.safety_warning:
-            pdf.set_fill_color(241, 196, 15) # Yellow
-            pdf.set_text_color(0, 0, 0)
-            pdf.set_font("Arial", 'B', 10)
-            pdf.cell(0, indicator_height, "SAFETY WARNING", 1, 1, 'C', fill=True)
-            pdf.ln(2)
-        
-        if page.quality_check:
-            pdf.set_fill_color(52, 152, 219) # Blue
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font("Arial", 'B', 10)
-            pdf.cell(0, indicator_height, "QUALITY CHECK", 1, 1, 'C', fill=True)
-            pdf.ln(2)
+    def load_pending_pages(self, pages):
+        """Builds the rest of a lazily loaded project a batch at a time, between UI events."""
+        if pages is not self.pages or not isinstance(pages, LazyPageList):
+            return  # Another project was opened meanwhile
+        if pages.load_pending(PAGE_LOAD_BATCH):
+            self.after(1, self.load_pending_pages, pages)
 
-        # Reset colors and font
-        pdf.set_fill_color(255, 255, 255)
-        pdf.set_text_color(0, 0, 0)
-        # pdf.set_y(initial_y + (12 * (int(page.safety_warning) + int(page.quality_check))))
+    def recover_autosave(self):
+        """Offers to replay edits left in the journal by a session that did not close cleanly."""
+        if not os.path.exists(journal_path_for(self.project_file)):
+            return
+        recovered = [copy_page_dict(page_dict) for page_dict in page_dicts(self.pages)]
+        applied = recover_pages(self.project_file, recovered)
+        if not applied:
+            return
+        name = os.path.basename(self.project_file)
+        if messagebox.askyesno("Recover Unsaved Changes",
+                               f"{name} has {applied} unsaved change(s) from a session that did not close properly.\n\n"
+                               "Recover them?"):
+            self.pages = pages_from_data({'pages': recovered}, lazy=True)
+            self.write_project_file()
+        else:
+            os.remove(journal_path_for(self.project_file))
 
     def export_to_pdf(self):
         """Exports the current project to a PDF file."""
@@ -558,162 +718,22 @@ class EditorPage(tk.Frame):
         if not save_path:
             return
 
-        from fpdf import FPDF
-        pdf = FPDF(orientation='L', unit='mm', format='A4')
-
-        pdf.set_auto_page_break(auto=True, margin=15)
-
-        for i, page in enumerate(self.pages):
-            pdf.add_page()
-            self.export_warning_indicators_to_pdf(pdf, page)
-            
-            if page.page_type == 'title':
-                self.export_title_page(pdf, page, i + 1)
-            elif page.page_type == 'standard':
-                self.export_standard_page(pdf, page, i + 1)
-            elif page.page_type == 'full_image':
-                self.export_full_image_page(pdf, page, i + 1)
-
         try:
-            pdf.output(save_path)
-            messagebox.showinfo("Success", f"PDF exported to {save_path}")
+            if self.bundle is not None:
+                self.bundle.materialize_pages(self.pages)
+            # Rendering runs on a copy of the pages in the background; editing can continue meanwhile
+            self.export_btn.config(state=tk.DISABLED)
+            export_in_background(self, self.pages, save_path, self.get_export_dpi(),
+                                 on_complete=lambda outcome: self.export_btn.config(state=tk.NORMAL))
         except Exception as e:
+            self.export_btn.config(state=tk.NORMAL)
             messagebox.showerror("Error", f"Failed to export PDF: {e}")
     
-    def export_title_page(self, pdf, page, page_num):
-        """Export a title page with metadata to PDF."""
-        # --- Title ---
-        pdf.set_font("Arial", 'B', 28)
-        pdf.set_y(80)  # Position title to make space for metadata
-        if page.title.strip():
-            pdf.multi_cell(0, 15, page.title.strip(), 0, 'C')
-        else:
-            pdf.multi_cell(0, 15, "Untitled Procedure", 0, 'C')
-        pdf.ln(20)
-
-        # --- Metadata Table ---
-        pdf.set_font("Arial", '', 12)
-        
-        # Define column widths and positions
-        col_width = (pdf.w - 2 * 15) / 2  # Two columns
-        left_col_x = pdf.l_margin
-        right_col_x = left_col_x + col_width
+    def get_export_dpi(self):
+        """Returns the selected export image DPI, or None to embed original images."""
+        value = self.export_dpi_var.get()
+        return int(value) if value.isdigit() else None
 
-        # Store initial Y position to align columns
-        initial_y = pdf.get_y()
-        
-        # --- Left Column ---
-        pdf.set_x(left_col_x)
-        pdf.cell(30, 10, "Created by:", 0, 0)
-        pdf.cell(col_width - 30, 10, page.created_by, 0, 1)
-        
-        pdf.set_x(left_col_x)
-        pdf.cell(30, 10, "Date:", 0, 0)
-        pdf.cell(col_width - 30, 10, page.date, 0, 1)
-
-        pdf.set_x(left_col_x)
-        pdf.cell(30, 10, "Version:", 0, 0)
-        pdf.cell(col_width - 30, 10, page.version, 0, 1)
-
-        # --- Right Column ---
-        pdf.set_y(initial_y)  # Reset Y to align with the top of the left column
-        
-        pdf.set_x(right_col_x)
-        pdf.cell(35, 10, "Approved by:", 0, 0)
-        pdf.cell(col_width - 35, 10, page.approved_by, 0, 1)
-
-        pdf.set_x(right_col_x)
-        pdf.cell(35, 10, "Approval Date:", 0, 0)
-        pdf.cell(col_width - 35, 10, page.approval_date, 0, 1)
-    
-    def export_standard_page(self, pdf, page, page_num):
-        """Export a standard page (3 bullets + 2 images) to PDF."""
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, f"Page {page_num}", 0, 1, 'C')
-        pdf.ln(5)
-
-        col_width = (pdf.w - 2 * 15 - 10) / 2
-        text_col_x = 15
-        img_col_x = 15 + col_width + 10
-        
-        current_y = pdf.get_y()
-
-        # Calculate vertical positions for the three bullet points
-        content_h = pdf.h - current_y - 15 # 15 is bottom margin
-        bullet_y_positions = [current_y, current_y + (content_h / 3), current_y + 2 * (content_h / 3)]
-
-        pdf.set_font("Arial", '', 12)
-        max_y_after_text = current_y
-        for i, bullet in enumerate(page.bullets):
-            if bullet.strip():
-                pdf.set_y(bullet_y_positions[i])
-                pdf.set_x(text_col_x)
-                pdf.multi_cell(col_width, 10, f'* {bullet.strip()}')
-                max_y_after_text = max(max_y_after_text, pdf.get_y())
-
-        pdf.set_y(current_y)
-
-        img_paths = [page.image_path1, page.image_path2]
-        img_y_positions = [current_y, current_y + ((pdf.h - 2 * 15 - 20) / 2) + 5]
-
-        for idx, img_path in enumerate(img_paths):
-            if img_path and os.path.exists(img_path):
-                try:
-                    img = Image.open(img_path)
-                    w, h = img.size
-                    aspect_ratio = w / h
-                    display_w = col_width
-                    display_h = display_w / aspect_ratio
-                    max_h = (pdf.h - 2 * 15 - 20) / 2 - 5
-                    if display_h > max_h:
-                        display_h = max_h
-                        display_w = display_h * aspect_ratio
-                    
-                    pdf.image(img_path, x=img_col_x + (col_width - display_w) / 2, y=img_y_positions[idx], w=display_w, h=display_h)
-                except Exception as e:
-                    print(f"Could not add image {img_path} to PDF. Error: {e}")
-        
-        if max_y_after_text > pdf.get_y():
-            pdf.set_y(max_y_after_text)
-    
-    def export_full_image_page(self, pdf, page, page_num):
-        """Export a full image page to PDF."""
-        if page.full_image_path and os.path.exists(page.full_image_path):
-            try:
-                img = Image.open(page.full_image_path)
-                w, h = img.size
-                aspect_ratio = w / h
-                
-                # Calculate dimensions to fit the page with margins
-                page_w = pdf.w - 30  # 15mm margin on each side
-                page_h = pdf.h - 30  # 15mm margin on top and bottom
-                
-                if aspect_ratio > (page_w / page_h):
-                    # Image is wider, fit to width
-                    display_w = page_w
-                    display_h = page_w / aspect_ratio
-                else:
-                    # Image is taller, fit to height
-                    display_h = page_h
-                    display_w = page_h * aspect_ratio
-                
-                # Center the image
-                x = (pdf.w - display_w) / 2
-                y = (pdf.h - display_h) / 2
-                
-                pdf.image(page.full_image_path, x=x, y=y, w=display_w, h=display_h)
-            except Exception as e:
-                print(f"Could not add full image {page.full_image_path} to PDF. Error: {e}")
-                # Show placeholder text if image fails
-                pdf.set_font("Arial", '', 16)
-                pdf.set_y(pdf.h / 2)
-                pdf.cell(0, 10, "Image could not be loaded", 0, 1, 'C')
-        else:
-            # No image assigned, show placeholder
-            pdf.set_font("Arial", '', 16)
-            pdf.set_y(pdf.h / 2)
-            pdf.cell(0, 10, "No image assigned", 0, 1, 'C')
-    
     def upload_to_sharepoint(self):
         """Upload the current project to SharePoint."""
         # Save the project first if it hasn't been saved
@@ -726,13 +746,12 @@ class EditorPage(tk.Frame):
             # Save current changes
             self.save_current_page_data()
             try:
-                data = {'pages': [page.to_dict() for page in self.pages]}
-                with open(self.project_file, 'w') as f:
-                    json.dump(data, f, indent=4)
+                self.write_project_file()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save project: {e}")
                 return
         
+        from .sharepoint_uploader import upload_to_sharepoint
         try:
             upload_to_sharepoint(self, self.project_file)
         except Exception as e:
@@ -0,0 +1,127 @@
+"""
+Verified, resumable file copies to network shares.
+The file is written in large chunks to a .partial file next to the
+destination, flushed to disk, read back and checked against the source's
+SHA-256, and only then renamed into place, so an interrupted copy never leaves
+a truncated file under the final name. A later copy of the same source
+continues the partial file, and a destination that already holds identical
+content is left alone.
+"""
+
+import json
+import os
+import shutil
+
+from . import tracing
+from .image_store import hash_file
+
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+PARTIAL_SUFFIX = ".partial"
+
+class CopyError(Exception):
+    """Raised when the copied file does not match its source."""
+
+class CopyCancelled(Exception):
+    """Raised when a copy is cancelled between chunks; the partial file is kept for resuming."""
+
+def source_signature(path):
+    st = os.stat(path)
+    return {'source': os.path.abspath(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+class NetworkCopy:
+    """Copies one file; run() returns 'skipped', 'resumed' or 'copied'.
+
+    on_progress(copied_bytes, total_bytes) is called after each chunk.
+    """
+
+    def __init__(self, source, destination, chunk_size=COPY_CHUNK_SIZE, on_progress=None, cancel_event=None):
+        self.source = source
+        self.destination = destination
+        self.partial_path = destination + PARTIAL_SUFFIX
+        self.state_path = self.partial_path + ".info"  # Which source version the partial file belongs to
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cancel_event = cancel_event
+        self.total = os.path.getsize(source)
+
+    def progress(self, copied):
+        if self.on_progress:
+            self.on_progress(copied, self.total)
+
+    def is_identical(self, source_hash):
+        try:
+            if os.path.getsize(self.destination) != self.total:
+                return False
+            return hash_file(self.destination) == source_hash
+        except OSError:
+            return False
+
+    def resume_offset(self, signature):
+        """Returns how much of a previous partial copy of this same source can be kept."""
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            size = os.path.getsize(self.partial_path)
+        except (OSError, ValueError):
+            return 0
+        return size if state == signature and size <= self.total else 0
+
+    def discard_partial(self):
+        for path in (self.partial_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write_partial(self, offset):
+        """Appends the source from offset to the partial file."""
+        with open(self.source, 'rb') as src, open(self.partial_path, 'r+b' if offset else 'wb') as dst:
+            src.seek(offset)
+            dst.seek(offset)
+            dst.truncate()
+            copied = offset
+            self.progress(copied)
+            for chunk in iter(lambda: src.read(self.chunk_size), b''):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    raise CopyCancelled()
+                dst.write(chunk)
+                tracing.count("bytes_written", len(chunk))
+                copied += len(chunk)
+                self.progress(copied)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+    def run(self):
+        with tracing.span("network_copy", file=os.path.basename(self.source), size=self.total):
+            return self.copy()
+
+    def copy(self):
+        signature = source_signature(self.source)
+        source_hash = hash_file(self.source)
+        if self.is_identical(source_hash):
+            self.discard_partial()
+            self.progress(self.total)
+            return 'skipped'
+
+        os.makedirs(os.path.dirname(self.destination) or ".", exist_ok=True)
+        offset = self.resume_offset(signature)
+        resumed = offset > 0
+        while True:
+            if offset == 0:
+                with open(self.state_path, 'w') as f:
+                    json.dump(signature, f)
+            self.write_partial(offset)
+            if hash_file(self.partial_path) == source_hash:
+                break
+            self.discard_partial()
+            if offset == 0:
+                raise CopyError(f"Copy of {os.path.basename(self.source)} does not match the original")
+            # The resumed part was stale or damaged; copy the whole file once more
+            offset, resumed = 0, False
+
+        shutil.copystat(self.source, self.partial_path)
+        os.replace(self.partial_path, self.destination)
+        os.remove(self.state_path)
+        return 'resumed' if resumed else 'copied'
+
+def copy_verified(source, destination, on_progress=None, cancel_event=None):
+    """Copies source to destination through a verified .partial file; see NetworkCopy."""
+    return NetworkCopy(source, destination, on_progress=on_progress, cancel_event=cancel_event).run()
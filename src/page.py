@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+from collections.abc import MutableSequence
+
+class Page:
+    # Slots keep each page small; large procedures hold thousands of these
+    __slots__ = ('page_type', 'title', 'bullets', 'image_path1', 'image_path2', 'full_image_path',
+                 'created_by', 'date', 'version', 'approved_by', 'approval_date',
+                 'safety_warning', 'quality_check')
+
+    def __init__(self, page_type='standard', title="", bullets=None, image_path1=None, image_path2=None, full_image_path=None,
+                 created_by="", date="", version="", approved_by="", approval_date="",
+                 safety_warning=False, quality_check=False):
+        self.page_type = page_type
+        self.title = title
+        self.bullets = bullets if bullets is not None else ["", "", ""]
+        self.image_path1 = image_path1
+        self.image_path2 = image_path2
+        self.full_image_path = full_image_path
+        # New title page fields
+        self.created_by = created_by
+        self.date = date
+        self.version = version
+        self.approved_by = approved_by
+        self.approval_date = approval_date
+        # New warning/check fields
+        self.safety_warning = safety_warning
+        self.quality_check = quality_check
+
+    def to_dict(self):
+        return {
+            'page_type': self.page_type,
+            'title': self.title,
+            'bullets': self.bullets,
+            'image_path1': self.image_path1,
+            'image_path2': self.image_path2,
+            'full_image_path': self.full_image_path,
+            'created_by': self.created_by,
+            'date': self.date,
+            'version': self.version,
+            'approved_by': self.approved_by,
+            'approval_date': self.approval_date,
+            'safety_warning': self.safety_warning,
+            'quality_check': self.quality_check
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            page_type=data.get('page_type', 'standard'),
+            title=data.get('title', ''),
+            bullets=data.get('bullets', ["", "", ""]),
+            image_path1=data.get('image_path1'),
+            image_path2=data.get('image_path2'),
+            full_image_path=data.get('full_image_path'),
+            created_by=data.get('created_by', ''),
+            date=data.get('date', ''),
+            version=data.get('version', ''),
+            approved_by=data.get('approved_by', ''),
+            approval_date=data.get('approval_date', ''),
+            safety_warning=data.get('safety_warning', False),
+            quality_check=data.get('quality_check', False)
+        )
+
+def copy_value(value):
+    """Copies a page field value; only the bullets list is mutable."""
+    return list(value) if isinstance(value, list) else value
+
+def copy_page_dict(page_dict):
+    return {key: copy_value(value) for key, value in page_dict.items()}
+
+class LazyPageList(MutableSequence):
+    """A page list that keeps pages as parsed dicts and builds each Page the first time it is used.
+
+    Opening a large project then only costs the JSON parse: the editor builds
+    the page it shows first and the rest in the background with load_pending(),
+    after which the dicts are gone and only the compact Page objects remain.
+    """
+
+    def __init__(self, page_dicts):
+        self.items = list(page_dicts)
+        self.load_cursor = 0
+
+    def load_pending(self, limit):
+        """Builds up to limit not-yet-loaded pages in order. Returns True while some remain."""
+        end = min(self.load_cursor + limit, len(self.items))
+        for index in range(self.load_cursor, end):
+            self[index]
+        self.load_cursor = end
+        return end < len(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.items)))]
+        item = self.items[index]
+        if not isinstance(item, Page):
+            # Page.from_dict fills in defaults for fields missing from older projects
+            item = Page.from_dict(item)
+            self.items[index] = item
+        return item
+
+    def __setitem__(self, index, page):
+        self.items[index] = page
+
+    def __delitem__(self, index):
+        del self.items[index]
+
+    def insert(self, index, page):
+        self.items.insert(index, page)
+
+    def page_dict(self, index):
+        """Returns the page's data without building a Page. Do not modify the result."""
+        item = self.items[index]
+        return item.to_dict() if isinstance(item, Page) else item
+
+    def loaded(self):
+        """Yields (index, Page) for the pages that have been built; only these can have been edited."""
+        for index, item in enumerate(self.items):
+            if isinstance(item, Page):
+                yield index, item
+
+def page_dicts(pages):
+    """Returns the data of every page, without building pages a LazyPageList has not loaded yet."""
+    if isinstance(pages, LazyPageList):
+        return [pages.page_dict(i) for i in range(len(pages))]
+    return [page.to_dict() for page in pages]
+
+def loaded_pages(pages):
+    """Yields (index, Page) for every page that may have been edited."""
+    if isinstance(pages, LazyPageList):
+        return pages.loaded()
+    return enumerate(pages)
+
+def pages_from_data(data, lazy=False):
+    """Builds Page objects from parsed project data, or a LazyPageList that builds them on use."""
+    if lazy:
+        return LazyPageList(data['pages'])
+    return [Page.from_dict(page_data) for page_data in data['pages']]
+
+def load_project_pages(project_file, lazy=False):
+    """Reads a .vmp file (or .vmpz bundle) and returns its pages as Page objects."""
+    from .vmpz import is_bundle, VmpzBundle
+    if is_bundle(project_file):
+        # Callers that render everything need the images on disk up front
+        with VmpzBundle(project_file) as bundle:
+            pages = pages_from_data(bundle.read_project(), lazy)
+            bundle.materialize_pages(pages)
+        return pages
+    with open(project_file, 'r') as f:
+        data = json.load(f)
+    return pages_from_data(data, lazy)
+
+def write_project_data(project_file, data):
+    """Writes project JSON through a synced temporary file, so a crash never leaves a truncated project."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(project_file)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, project_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
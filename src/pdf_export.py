@@ -0,0 +1,248 @@
+"""
+PDF rendering for VMP projects.
+These functions only depend on Page objects, so they can be used both from the
+editor and from the headless batch exporter.
+"""
+
+import os
+from PIL import Image
+from .image_derivatives import DerivativeCache
+from . import tracing
+
+# Resolution images are resampled to for their placed size; None embeds originals
+DEFAULT_EXPORT_DPI = 200
+
+_derivative_cache = None
+_page_cache = None
+
+class ExportCancelled(Exception):
+    """Raised by build_pdf when its cancel_event is set."""
+
+def image_for_placement(img_path, display_w, display_h, target_dpi):
+    """Returns the file to embed for an image placed at display_w x display_h mm."""
+    global _derivative_cache
+    if not target_dpi:
+        return img_path
+    if _derivative_cache is None:
+        _derivative_cache = DerivativeCache()
+    try:
+        return _derivative_cache.get(img_path, display_w, display_h, target_dpi)
+    except Exception as e:
+        print(f"Could not downsample {img_path}, embedding original. Error: {e}")
+        return img_path
+
+def export_warning_indicators_to_pdf(pdf, page):
+    """Draws colored warning indicators at the top of a PDF page."""
+    indicator_height = 8
+
+    if page.safety_warning:
+        pdf.set_fill_color(241, 196, 15) # Yellow
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("Arial", 'B', 10)
+        pdf.cell(0, indicator_height, "SAFETY WARNING", 1, 1, 'C', fill=True)
+        pdf.ln(2)
+
+    if page.quality_check:
+        pdf.set_fill_color(52, 152, 219) # Blue
+        pdf.set_text_color(255, 255, 255)
+        pdf.set_font("Arial", 'B', 10)
+        pdf.cell(0, indicator_height, "QUALITY CHECK", 1, 1, 'C', fill=True)
+        pdf.ln(2)
+
+    # Reset colors and font
+    pdf.set_fill_color(255, 255, 255)
+    pdf.set_text_color(0, 0, 0)
+
+def export_title_page(pdf, page, page_num):
+    """Export a title page with metadata to PDF."""
+    # --- Title ---
+    pdf.set_font("Arial", 'B', 28)
+    pdf.set_y(80)  # Position title to make space for metadata
+    if page.title.strip():
+        pdf.multi_cell(0, 15, page.title.strip(), 0, 'C')
+    else:
+        pdf.multi_cell(0, 15, "Untitled Procedure", 0, 'C')
+    pdf.ln(20)
+
+    # --- Metadata Table ---
+    pdf.set_font("Arial", '', 12)
+
+    # Define column widths and positions
+    col_width = (pdf.w - 2 * 15) / 2  # Two columns
+    left_col_x = pdf.l_margin
+    right_col_x = left_col_x + col_width
+
+    # Store initial Y position to align columns
+    initial_y = pdf.get_y()
+
+    # --- Left Column ---
+    pdf.set_x(left_col_x)
+    pdf.cell(30, 10, "Created by:", 0, 0)
+    pdf.cell(col_width - 30, 10, page.created_by, 0, 1)
+
+    pdf.set_x(left_col_x)
+    pdf.cell(30, 10, "Date:", 0, 0)
+    pdf.cell(col_width - 30, 10, page.date, 0, 1)
+
+    pdf.set_x(left_col_x)
+    pdf.cell(30, 10, "Version:", 0, 0)
+    pdf.cell(col_width - 30, 10, page.version, 0, 1)
+
+    # --- Right Column ---
+    pdf.set_y(initial_y)  # Reset Y to align with the top of the left column
+
+    pdf.set_x(right_col_x)
+    pdf.cell(35, 10, "Approved by:", 0, 0)
+    pdf.cell(col_width - 35, 10, page.approved_by, 0, 1)
+
+    pdf.set_x(right_col_x)
+    pdf.cell(35, 10, "Approval Date:", 0, 0)
+    pdf.cell(col_width - 35, 10, page.approval_date, 0, 1)
+
+def export_standard_page(pdf, page, page_num, target_dpi=None):
+    """Export a standard page (3 bullets + 2 images) to PDF."""
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, f"Page {page_num}", 0, 1, 'C')
+    pdf.ln(5)
+
+    col_width = (pdf.w - 2 * 15 - 10) / 2
+    text_col_x = 15
+    img_col_x = 15 + col_width + 10
+
+    current_y = pdf.get_y()
+
+    # Calculate vertical positions for the three bullet points
+    content_h = pdf.h - current_y - 15 # 15 is bottom margin
+    bullet_y_positions = [current_y, current_y + (content_h / 3), current_y + 2 * (content_h / 3)]
+
+    pdf.set_font("Arial", '', 12)
+    max_y_after_text = current_y
+    for i, bullet in enumerate(page.bullets):
+        if bullet.strip():
+            pdf.set_y(bullet_y_positions[i])
+            pdf.set_x(text_col_x)
+            pdf.multi_cell(col_width, 10, f'* {bullet.strip()}')
+            max_y_after_text = max(max_y_after_text, pdf.get_y())
+
+    pdf.set_y(current_y)
+
+    img_paths = [page.image_path1, page.image_path2]
+    img_y_positions = [current_y, current_y + ((pdf.h - 2 * 15 - 20) / 2) + 5]
+
+    for idx, img_path in enumerate(img_paths):
+        if img_path and os.path.exists(img_path):
+            try:
+                img = Image.open(img_path)
+                w, h = img.size
+                aspect_ratio = w / h
+                display_w = col_width
+                display_h = display_w / aspect_ratio
+                max_h = (pdf.h - 2 * 15 - 20) / 2 - 5
+                if display_h > max_h:
+                    display_h = max_h
+                    display_w = display_h * aspect_ratio
+
+                pdf.image(image_for_placement(img_path, display_w, display_h, target_dpi),
+                          x=img_col_x + (col_width - display_w) / 2, y=img_y_positions[idx], w=display_w, h=display_h)
+            except Exception as e:
+                print(f"Could not add image {img_path} to PDF. Error: {e}")
+
+    if max_y_after_text > pdf.get_y():
+        pdf.set_y(max_y_after_text)
+
+def export_full_image_page(pdf, page, page_num, target_dpi=None):
+    """Export a full image page to PDF."""
+    if page.full_image_path and os.path.exists(page.full_image_path):
+        try:
+            img = Image.open(page.full_image_path)
+            w, h = img.size
+            aspect_ratio = w / h
+
+            # Calculate dimensions to fit the page with margins
+            page_w = pdf.w - 30  # 15mm margin on each side
+            page_h = pdf.h - 30  # 15mm margin on top and bottom
+
+            if aspect_ratio > (page_w / page_h):
+                # Image is wider, fit to width
+                display_w = page_w
+                display_h = page_w / aspect_ratio
+            else:
+                # Image is taller, fit to height
+                display_h = page_h
+                display_w = page_h * aspect_ratio
+
+            # Center the image
+            x = (pdf.w - display_w) / 2
+            y = (pdf.h - display_h) / 2
+
+            pdf.image(image_for_placement(page.full_image_path, display_w, display_h, target_dpi),
+                      x=x, y=y, w=display_w, h=display_h)
+        except Exception as e:
+            print(f"Could not add full image {page.full_image_path} to PDF. Error: {e}")
+            # Show placeholder text if image fails
+            pdf.set_font("Arial", '', 16)
+            pdf.set_y(pdf.h / 2)
+            pdf.cell(0, 10, "Image could not be loaded", 0, 1, 'C')
+    else:
+        # No image assigned, show placeholder
+        pdf.set_font("Arial", '', 16)
+        pdf.set_y(pdf.h / 2)
+        pdf.cell(0, 10, "No image assigned", 0, 1, 'C')
+
+def render_page(pdf, page, page_num, target_dpi=None):
+    """Adds one VMP page to the PDF."""
+    pdf.add_page()
+    export_warning_indicators_to_pdf(pdf, page)
+
+    if page.page_type == 'title':
+        export_title_page(pdf, page, page_num)
+    elif page.page_type == 'standard':
+        export_standard_page(pdf, page, page_num, target_dpi)
+    elif page.page_type == 'full_image':
+        export_full_image_page(pdf, page, page_num, target_dpi)
+
+def build_pdf(pages, target_dpi=None, use_cache=True, on_progress=None, cancel_event=None):
+    """Lays out all pages into a new FPDF document.
+
+    With target_dpi, images are downsampled to that resolution at their placed size.
+    With use_cache, pages unchanged since an earlier export are reused instead of laid out again.
+    on_progress(done, total) is called after each page, and setting cancel_event
+    (a threading.Event) stops the build with ExportCancelled.
+    """
+    global _page_cache
+    from .pdf_page_cache import RecordingPDF, PageRenderCache
+    pdf = RecordingPDF(orientation='L', unit='mm', format='A4')
+
+    pdf.set_auto_page_break(auto=True, margin=15)
+    # Register fonts up front so their resource names are the same in every export
+    pdf.set_font("Arial", '', 12)
+    pdf.set_font("Arial", 'B', 12)
+
+    if use_cache and _page_cache is None:
+        _page_cache = PageRenderCache()
+
+    for i, page in enumerate(pages):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        with tracing.span("render_page", page=i + 1, type=page.page_type):
+            if use_cache:
+                if _page_cache.render(pdf, page, i + 1, target_dpi,
+                                      lambda page=page, page_num=i + 1: render_page(pdf, page, page_num, target_dpi)):
+                    tracing.count("pdf_page_cache_hits")
+            else:
+                render_page(pdf, page, i + 1, target_dpi)
+        if on_progress:
+            on_progress(i + 1, len(pages))
+
+    if use_cache:
+        _page_cache.prune()
+    return pdf
+
+def export_pages_to_pdf(pages, save_path, target_dpi=None, on_progress=None, cancel_event=None):
+    """Renders the given pages and writes the PDF to save_path."""
+    with tracing.span("export_pdf", pages=len(pages)):
+        with tracing.span("build_pdf"):
+            pdf = build_pdf(pages, target_dpi, on_progress=on_progress, cancel_event=cancel_event)
+        with tracing.span("write_pdf"):
+            pdf.output(save_path)
+        tracing.count("bytes_written", os.path.getsize(save_path))
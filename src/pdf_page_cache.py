@@ -0,0 +1,200 @@
+"""
+Per-page render cache for PDF export.
+Laying out text is most of the cost of an export, so the content stream each
+VMP page renders to is kept on disk under a hash of the page data, the
+fingerprints of its images and the export settings. Unchanged pages are
+replayed into the new document as-is; only edited pages are laid out again.
+
+fpdf carries the font, colours and line width over from one page to the next
+and writes them at the top of each new page, so an entry stores only what the
+page drew after that preamble, is keyed by the state the page started from,
+and restores the state the page left behind when it is replayed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from fpdf import FPDF, __version__ as FPDF_VERSION
+
+# Bump when the layout code in pdf_export changes, so stale renders are not reused
+RENDER_VERSION = 2
+IMAGE_FIELDS = ('image_path1', 'image_path2', 'full_image_path')
+IMAGE_REF = re.compile(rb"/I(\d+) Do Q")
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+def default_cache_dir():
+    return os.path.join(os.getcwd(), ".vmp-cache", "pdf-pages")
+
+def image_fingerprint(image_path):
+    try:
+        st = os.stat(image_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return [os.path.abspath(image_path), st.st_size, st.st_mtime_ns]
+
+def color_values(color):
+    return [round(value * 255) for value in color.colors]
+
+def pdf_state(pdf):
+    """Returns the drawing state fpdf carries from one page to the next."""
+    return {
+        'font': [pdf.font_family, pdf.font_style, pdf.underline, pdf.font_size_pt],
+        'line_width': pdf.line_width,
+        'draw': color_values(pdf.draw_color),
+        'fill': color_values(pdf.fill_color),
+        'text': color_values(pdf.text_color),
+    }
+
+def restore_state(pdf, state):
+    """Puts pdf into a state recorded by pdf_state. This may write to the current page's content."""
+    family, style, underline, size = state['font']
+    if family:
+        pdf.set_font(family, style + ('U' if underline else ''), size)
+    pdf.set_line_width(state['line_width'])
+    pdf.set_draw_color(*state['draw'])
+    pdf.set_fill_color(*state['fill'])
+    pdf.set_text_color(*state['text'])
+
+class RecordingPDF(FPDF):
+    """FPDF that notes what each page drew, so a page can be replayed into another document.
+
+    Content streams refer to images by their index in the document, which
+    depends on what was drawn before; replaying renumbers those references.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.image_refs = {}  # page number -> [(start, end, image name)] of each image index in the content
+        self.preamble_ends = {}  # page number -> length of the state preamble add_page wrote
+        self.states_before = {}  # page number -> pdf_state when the page was added
+
+    def add_page(self, *args, **kwargs):
+        self.states_before[self.page + 1] = pdf_state(self)
+        super().add_page(*args, **kwargs)
+        self.preamble_ends[self.page] = len(self.pages[self.page].contents)
+
+    def image(self, name, *args, **kwargs):
+        start = len(self.pages[self.page].contents)
+        result = super().image(name, *args, **kwargs)
+        match = IMAGE_REF.search(self.pages[self.page].contents, start)
+        if match:
+            self.image_refs.setdefault(self.page, []).append((match.start(1), match.end(1), str(name)))
+        return result
+
+class PageRenderCache:
+    """Stores the rendered PDF content of individual VMP pages, keyed by everything that affects it."""
+
+    def __init__(self, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, page, page_num, target_dpi, state):
+        page_dict = page.to_dict()
+        parts = {
+            'page': page_dict,
+            'images': [image_fingerprint(page_dict[field]) for field in IMAGE_FIELDS if page_dict.get(field)],
+            'dpi': target_dpi,
+            # Only standard pages print their page number
+            'page_num': page_num if page.page_type == 'standard' else None,
+            # Drawing calls that match the current state write nothing, so the output depends on it
+            'state': state,
+            'renderer': [RENDER_VERSION, FPDF_VERSION],
+        }
+        return hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key + ".bin")
+
+    def load(self, key):
+        """Returns [(content, image refs, end state)] for each PDF page of a cached render, or None."""
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                chunks = []
+                for chunk in header['chunks']:
+                    content = f.read(chunk['length'])
+                    if len(content) != chunk['length']:
+                        return None
+                    chunks.append((content, [tuple(ref) for ref in chunk['images']], chunk['state']))
+            os.utime(path)  # Recently used entries survive pruning
+            return chunks
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, key, chunks):
+        header = {'chunks': [{'length': len(content), 'images': refs, 'state': state}
+                             for content, refs, state in chunks]}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b"\n")
+                for content, refs, state in chunks:
+                    f.write(content)
+            os.replace(tmp_path, self.path_for(key))
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            print(f"Could not cache rendered page: {e}")
+
+    def prune(self):
+        """Deletes the least recently used entries until the cache fits max_bytes."""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [(entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                           for entry in it if entry.name.endswith(".bin")]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def replay(self, pdf, chunks):
+        for content, refs, state in chunks:
+            pdf.add_page()
+            contents = pdf.pages[pdf.page].contents
+            preamble_end = len(contents)
+            # Leave pdf in the state the page ended in, as if it had been drawn; the
+            # output this writes is dropped, the cached content already contains it
+            restore_state(pdf, state)
+            del contents[preamble_end:]
+            position = 0
+            for start, end, name in refs:
+                info = pdf.preload_image(name)[2]
+                contents += content[position:start]
+                contents += str(info['i']).encode('ascii')
+                position = end
+            contents += content[position:]
+
+    def render(self, pdf, page, page_num, target_dpi, render_page):
+        """Adds page to pdf from the cache, or by calling render_page() and caching what it drew.
+
+        Returns True on a cache hit.
+        """
+        key = self.key(page, page_num, target_dpi, pdf_state(pdf))
+        chunks = self.load(key)
+        # Downsampled images live in their own cache and may have been cleared since
+        if chunks is not None and all(os.path.exists(name) for _, refs, _ in chunks for _, _, name in refs):
+            self.replay(pdf, chunks)
+            return True
+
+        first_page = pdf.page + 1
+        render_page()
+        # Long bullet text can spill onto extra PDF pages; they are all part of this entry
+        chunks = []
+        for n in range(first_page, pdf.page + 1):
+            preamble_end = pdf.preamble_ends[n]
+            refs = [(start - preamble_end, end - preamble_end, name) for start, end, name in pdf.image_refs.get(n, [])]
+            state = pdf.states_before[n + 1] if n < pdf.page else pdf_state(pdf)
+            chunks.append((bytes(pdf.pages[n].contents[preamble_end:]), refs, state))
+        self.store(key, chunks)
+        return False
@@ -0,0 +1,64 @@
+"""
+In-process LRU cache of scaled editor preview images.
+Entries are keyed by (path, mtime, target size) and bounded by a byte budget,
+so revisiting a page or reusing a screenshot on several pages renders from
+memory instead of decoding the full-size file again. Hits and misses are
+recorded as preview_cache_hits/preview_cache_misses in performance traces.
+"""
+
+import os
+from collections import OrderedDict
+from PIL import Image
+
+from . import tracing
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # Memory budget for decoded page previews kept between page visits
+
+class PreviewCache:
+    """Least-recently-used cache of decoded, scaled PIL images."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (path, mtime_ns, size) -> (image, nbytes)
+        self.current_bytes = 0
+
+    @staticmethod
+    def image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def get(self, image_path, size):
+        """Returns image_path scaled to fit size, decoding it only on a miss."""
+        path = os.path.abspath(image_path)
+        key = (path, os.stat(path).st_mtime_ns, tuple(size))
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            tracing.count("preview_cache_hits")
+            return entry[0]
+
+        tracing.count("preview_cache_misses")
+        tracing.count("images_decoded")
+        with Image.open(path) as img:
+            if img.format == 'JPEG':
+                img.draft('RGB', (size[0] * 2, size[1] * 2))
+            img.thumbnail(size)
+            img.load()
+            preview = img if img.mode in ('RGB', 'RGBA', 'L', 'LA') else img.convert('RGBA')
+
+        nbytes = self.image_bytes(preview)
+        if nbytes <= self.max_bytes:
+            self.entries[key] = (preview, nbytes)
+            self.current_bytes += nbytes
+            self.evict()
+        return preview
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits its byte budget."""
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.current_bytes -= nbytes
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
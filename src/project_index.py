@@ -0,0 +1,113 @@
+"""
+Persistent index of project summary metadata for the home page.
+Each entry is validated against the project file's size and mtime, so only
+new or changed projects are parsed on refresh.
+"""
+
+import json
+import os
+
+from .dir_snapshot import DirectorySnapshot
+from .vmpz import is_bundle, read_bundle_project
+
+PROJECT_EXTENSIONS = ('.vmp', '.vmpz')
+
+def default_index_path():
+    return os.path.join(os.getcwd(), ".vmp-cache", "project_index.json")
+
+def summarize_project(project_path):
+    """Parses a project file and returns the fields shown on the home page."""
+    if is_bundle(project_path):
+        # Only the project JSON member is read, not the bundled images
+        project_data = read_bundle_project(project_path)
+    else:
+        with open(project_path, 'r') as f:
+            project_data = json.load(f)
+    filename = os.path.basename(project_path)
+    return {
+        'name': project_data.get('name', os.path.splitext(filename)[0]),
+        'created': project_data.get('created', 'Unknown'),
+        'page_count': len(project_data.get('pages', [])),
+    }
+
+class ProjectIndex:
+    """Caches per-project summaries keyed by filename."""
+
+    VERSION = 1
+
+    def __init__(self, projects_dir, index_path=None):
+        self.projects_dir = projects_dir
+        self.index_path = index_path or default_index_path()
+        self.entries = {}
+        self.dirty = False
+        self.snapshot = DirectorySnapshot(projects_dir, PROJECT_EXTENSIONS)
+        self.load()
+
+    def load(self):
+        """Loads the saved index, starting empty if it is missing, corrupt or for another folder."""
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('projects_dir') == os.path.abspath(self.projects_dir):
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Writes the index back to disk if anything changed."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'projects_dir': os.path.abspath(self.projects_dir),
+                       'entries': self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    def update_entry(self, filename, st):
+        """Re-parses one project if its size or mtime differ from the indexed entry."""
+        entry = self.entries.get(filename)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry
+
+        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        try:
+            entry.update(summarize_project(os.path.join(self.projects_dir, filename)))
+        except Exception:
+            entry['error'] = True  # Corrupted files are skipped until they change again
+        self.entries[filename] = entry
+        self.dirty = True
+        return entry
+
+    def refresh(self):
+        """Brings the index up to date with the projects folder and returns the DirectoryDelta."""
+        delta = self.snapshot.scan()
+        for filename in delta.added + delta.modified:
+            self.update_entry(filename, self.snapshot.stats[filename])
+
+        # On the first scan the saved index may still list projects deleted since last run
+        removed = delta.removed
+        if delta.initial:
+            removed = [f for f in self.entries if f not in self.snapshot.entries]
+        for filename in removed:
+            if self.entries.pop(filename, None) is not None:
+                self.dirty = True
+
+        try:
+            self.save()
+        except OSError as e:
+            print(f"Could not save project index: {e}")
+        return delta
+
+    def summary(self, filename):
+        """Returns the summary for one project, or None if it is missing or unreadable."""
+        entry = self.entries.get(filename)
+        if entry is None or entry.get('error'):
+            return None
+        return dict(entry, filename=filename)
+
+    def summaries(self):
+        """Returns the indexed projects as dicts including their filename."""
+        return [dict(entry, filename=filename) for filename, entry in self.entries.items()
+                if not entry.get('error')]
@@ -0,0 +1,244 @@
+"""
+Delta sync of projects, images and exported PDFs with a shared folder.
+Both sides are described by a manifest of content hashes. Hashes are reused
+while a file's size and mtime are unchanged, so a sync only reads files that
+changed. The manifest from the previous sync is kept as the common base. A
+file is copied from the side whose hash differs from the base to the side
+that still matches it; timestamps play no part. Files changed on both sides
+are reported as conflicts and left alone.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .image_store import hash_file
+from .network_copy import copy_verified
+
+SYNC_FOLDERS = {
+    'VMP-Projects': ('.vmp', '.vmpz', '.json', '.pdf'),
+    'VMP-Images': ('.png', '.jpg', '.jpeg', '.gif', '.bmp'),
+}
+MANIFEST_FILE = ".vmp-manifest.json"
+SYNC_WORKERS = 4
+# Library images are stored under the SHA-256 of their content (see image_store)
+CONTENT_ADDRESSED = re.compile(r"[0-9a-f]{64}")
+
+def default_state_path(destination):
+    """Returns where the local manifest and sync base for a destination are kept."""
+    name = hashlib.sha1(os.path.abspath(destination).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(os.getcwd(), ".vmp-cache", "sync", name + ".json")
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def scan_manifest(root, previous=None):
+    """Returns {relative path: {'size', 'mtime_ns', 'hash'}} for the synced files under root.
+
+    Entries in previous are reused without re-reading the file while its size and mtime still match.
+    """
+    previous = previous or {}
+    manifest = {}
+    for folder, extensions in SYNC_FOLDERS.items():
+        folder_path = os.path.join(root, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        with os.scandir(folder_path) as it:
+            for dir_entry in it:
+                if dir_entry.name.startswith('.') or not dir_entry.name.lower().endswith(extensions):
+                    continue
+                try:
+                    if not dir_entry.is_file():
+                        continue
+                    st = dir_entry.stat()
+                except OSError:
+                    continue  # Removed while we were scanning
+                rel_path = f"{folder}/{dir_entry.name}"
+                known = previous.get(rel_path)
+                if known and known['size'] == st.st_size and known['mtime_ns'] == st.st_mtime_ns:
+                    manifest[rel_path] = known
+                    continue
+                stem = os.path.splitext(dir_entry.name)[0]
+                content_hash = stem if folder == 'VMP-Images' and CONTENT_ADDRESSED.fullmatch(stem) else None
+                try:
+                    content_hash = content_hash or hash_file(dir_entry.path)
+                except OSError:
+                    continue
+                manifest[rel_path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': content_hash}
+    return manifest
+
+def plan_sync(local, remote, base, push=True, pull=True, propagate_deletes=False):
+    """Compares two manifests against the base from the last sync.
+
+    Returns a list of (action, relative path) where action is 'push', 'pull',
+    'delete-remote', 'delete-local' or 'conflict'. Files that are identical on
+    both sides, or that only one direction would touch when that direction is
+    disabled, are left out.
+    """
+    plan = []
+    for rel_path in sorted(set(local) | set(remote) | set(base)):
+        local_hash = local[rel_path]['hash'] if rel_path in local else None
+        remote_hash = remote[rel_path]['hash'] if rel_path in remote else None
+        base_hash = base.get(rel_path)
+        if local_hash == remote_hash:
+            continue
+        local_changed = local_hash != base_hash
+        remote_changed = remote_hash != base_hash
+        if local_changed and remote_changed:
+            plan.append(('conflict', rel_path))
+        elif local_changed and push:
+            if local_hash is not None:
+                plan.append(('push', rel_path))
+            elif propagate_deletes:
+                plan.append(('delete-remote', rel_path))
+        elif remote_changed and pull:
+            if remote_hash is not None:
+                plan.append(('pull', rel_path))
+            elif propagate_deletes:
+                plan.append(('delete-local', rel_path))
+    return plan
+
+class SyncResult:
+    """What a sync did, per file."""
+    def __init__(self):
+        self.done = []  # (action, relative path, bytes)
+        self.conflicts = []
+        self.errors = []  # (action, relative path, message)
+        self.unchanged = 0
+        self.seconds = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def bytes_transferred(self):
+        return sum(size for _, _, size in self.done)
+
+class ProjectSync:
+    """Keeps the project folders under local_root in sync with the same folders under destination."""
+
+    def __init__(self, local_root, destination, state_path=None):
+        self.local_root = local_root
+        self.destination = destination
+        self.state_path = state_path or default_state_path(destination)
+        self.remote_manifest_path = os.path.join(destination, MANIFEST_FILE)
+        self.local_manifest = {}
+        self.base = {}  # relative path -> hash both sides had after the last sync
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            if state.get('destination') == os.path.abspath(destination):
+                self.local_manifest = state.get('local', {})
+                self.base = state.get('base', {})
+        except (OSError, ValueError):
+            pass
+
+    def load_remote_manifest(self):
+        try:
+            with open(self.remote_manifest_path, 'r') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    def scan(self):
+        """Returns the current (local, remote) manifests."""
+        local = scan_manifest(self.local_root, self.local_manifest)
+        # The shared manifest saves hashing remote files, but it may have been written on
+        # another machine; entries are still checked against each remote file's size and mtime
+        remote = scan_manifest(self.destination, self.load_remote_manifest())
+        return local, remote
+
+    def transfer(self, action, rel_path):
+        local_path = os.path.join(self.local_root, *rel_path.split('/'))
+        remote_path = os.path.join(self.destination, *rel_path.split('/'))
+        if action == 'push':
+            copy_verified(local_path, remote_path)
+            return os.path.getsize(remote_path)
+        if action == 'pull':
+            copy_verified(remote_path, local_path)
+            return os.path.getsize(local_path)
+        os.remove(remote_path if action == 'delete-remote' else local_path)
+        return 0
+
+    def run(self, push=True, pull=True, propagate_deletes=False, dry_run=False, jobs=SYNC_WORKERS, on_action=None):
+        """Syncs both folders and returns a SyncResult. on_action(action, rel_path, error) is called per file."""
+        start = time.perf_counter()
+        result = SyncResult()
+        local, remote = self.scan()
+        plan = plan_sync(local, remote, self.base, push, pull, propagate_deletes)
+        result.conflicts = [rel_path for action, rel_path in plan if action == 'conflict']
+        transfers = [(action, rel_path) for action, rel_path in plan if action != 'conflict']
+        result.unchanged = sum(1 for rel_path, entry in local.items()
+                               if rel_path in remote and remote[rel_path]['hash'] == entry['hash'])
+
+        if dry_run:
+            result.done = [(action, rel_path, (local.get(rel_path) or remote.get(rel_path) or {}).get('size', 0))
+                           for action, rel_path in transfers]
+            result.seconds = time.perf_counter() - start
+            return result
+
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="sync") as executor:
+            futures = {executor.submit(self.transfer, action, rel_path): (action, rel_path)
+                       for action, rel_path in transfers}
+            for future in as_completed(futures):
+                action, rel_path = futures[future]
+                try:
+                    result.done.append((action, rel_path, future.result()))
+                    error = None
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    result.errors.append((action, rel_path, error))
+                if on_action:
+                    on_action(action, rel_path, error)
+
+        self.save_state()
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def save_state(self):
+        """Rescans both sides (cheap: only copied files are hashed again) and records the new base."""
+        local, remote = self.scan()
+        new_base = {}
+        for rel_path in set(local) | set(remote) | set(self.base):
+            local_hash = local[rel_path]['hash'] if rel_path in local else None
+            remote_hash = remote[rel_path]['hash'] if rel_path in remote else None
+            if local_hash == remote_hash:
+                if local_hash is not None:
+                    new_base[rel_path] = local_hash
+            elif rel_path in self.base:
+                # Still out of sync (failed, conflicting or skipped); keep the old base so the next run sees the same changes
+                new_base[rel_path] = self.base[rel_path]
+        self.local_manifest = local
+        self.base = new_base
+        write_json(self.state_path, {'destination': os.path.abspath(self.destination), 'local': local, 'base': new_base})
+        try:
+            write_json(self.remote_manifest_path, {'version': 1, 'files': remote})
+        except OSError as e:
+            print(f"Could not write the shared manifest: {e}")
+
+def format_sync_summary(result):
+    """Builds a per-file summary of a sync."""
+    lines = [f"  {action:<13} {rel_path}" for action, rel_path, _ in sorted(result.done, key=lambda d: d[1])]
+    lines += [f"  {'CONFLICT':<13} {rel_path} (changed on both sides, left as is)" for rel_path in result.conflicts]
+    lines += [f"  {'FAILED':<13} {rel_path}: {error}" for _, rel_path, error in result.errors]
+    pushed = sum(1 for action, _, _ in result.done if action == 'push')
+    pulled = sum(1 for action, _, _ in result.done if action == 'pull')
+    lines.append("")
+    lines.append(f"Pushed {pushed}, pulled {pulled}, {result.unchanged} unchanged, "
+                 f"{len(result.conflicts)} conflict(s), {len(result.errors)} failed; "
+                 f"{result.bytes_transferred / 1e6:.1f} MB in {result.seconds:.2f}s.")
+    return "\n".join(lines)
@@ -1,15 +1,112 @@
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
-import requests
 import json
 import urllib.parse
 import base64
 
+from .vmpz import is_bundle, bundle_for_sharing
+from .chunked_upload import ChunkedUploader, get_http_session
+from .network_copy import copy_verified
+from .tracing import traced
+
+# Common SharePoint network mappings
+NETWORK_PATHS = [
+    r"\\bobrick.sharepoint.com\sites\ManufacturingEngineering\Shared Documents",
+    r"\\bobrick.sharepoint.com@SSL\sites\ManufacturingEngineering\Shared Documents",
+    r"\\bobrick-my.sharepoint.com\sites\ManufacturingEngineering\Shared Documents",
+]
+PROBE_TIMEOUT = 0.75  # Seconds to wait for any network path to answer
+ROUTE_TTL = 15 * 60  # Seconds a working network path is reused without probing again
+# Base URL of an upload-session service (for example `python -m src.upload_server`); unset disables it
+UPLOAD_ENDPOINT = os.environ.get("VMP_UPLOAD_ENDPOINT")
+
+class RouteCache:
+    """Remembers the network path that last worked, persisted so new sessions skip probing too."""
+
+    def __init__(self, cache_path=None, ttl=ROUTE_TTL):
+        self.cache_path = cache_path or os.path.join(os.getcwd(), ".vmp-cache", "sharepoint_route.json")
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.route = None
+        self.confirmed_at = 0
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            self.route, self.confirmed_at = data['route'], data['confirmed_at']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self):
+        """Returns the remembered route if it was confirmed within the TTL."""
+        with self.lock:
+            if self.route and time.time() - self.confirmed_at < self.ttl:
+                return self.route
+            return None
+
+    def remember(self, route):
+        with self.lock:
+            self.route, self.confirmed_at = route, time.time()
+            data = {'route': self.route, 'confirmed_at': self.confirmed_at}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not save SharePoint route: {e}")
+
+    def forget(self):
+        """Drops the remembered route, on disk too, so the next session probes again."""
+        with self.lock:
+            self.route, self.confirmed_at = None, 0
+        try:
+            os.remove(self.cache_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not clear SharePoint route: {e}")
+
+_route_cache = None
+
+def get_route_cache():
+    global _route_cache
+    if _route_cache is None:
+        _route_cache = RouteCache()
+    return _route_cache
+
+def probe_network_paths(paths, timeout=PROBE_TIMEOUT):
+    """Checks all paths at once and returns the first that is reachable, or None after timeout.
+
+    Each check runs on its own daemon thread, because a dead UNC/WebDAV path can
+    block os.path.isdir for many seconds and must not delay the answer or exit.
+    """
+    answers = queue.Queue()
+    for path in paths:
+        threading.Thread(target=lambda p=path: answers.put((p, os.path.isdir(p))),
+                         name="sharepoint-probe", daemon=True).start()
+    deadline = time.monotonic() + timeout
+    for _ in paths:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            path, reachable = answers.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if reachable:
+            return path
+    return None
+
 class SharePointUploader:
     """Handles direct SharePoint upload using network access and sharing links."""
     
-    def __init__(self):
+    def __init__(self, route_cache=None):
+        self.route_cache = route_cache or get_route_cache()
         # Default SharePoint folder URL provided by user
         self.default_sharepoint_url = "https://bobrick.sharepoint.com/:f:/s/ManufacturingEngineering/ElsQrBO3x1BFid4ZQGzflwgBsltOVvplh7-wW4QjWMQ6Zw?e=WDzeie"
         self.site_url = "https://bobrick.sharepoint.com/sites/ManufacturingEngineering"
@@ -19,41 +116,57 @@ class SharePointUploader:
         """Test if we can access SharePoint via network without authentication."""
         try:
             # Try to access the SharePoint site to see if we have network access
-            response = requests.get(self.site_url, timeout=5)
+            response = get_http_session().get(self.site_url, timeout=5)
             return response.status_code in [200, 302, 401, 403]  # Any response means we can reach it
         except:
             return False
     
+    def find_network_root(self):
+        """Returns a reachable SharePoint network path, using the remembered route when it is fresh."""
+        route = self.route_cache.get()
+        if route:
+            return route
+        route = probe_network_paths(NETWORK_PATHS)
+        if route:
+            self.route_cache.remember(route)
+        return route
+
+    @traced("upload_via_network_path")
     def upload_via_network_path(self, file_path, custom_folder=None):
-        """Try to upload via mapped network drive or UNC path."""
+        """Try to upload via mapped network drive or UNC path. Safe to call off the Tk thread."""
         try:
-            # Common SharePoint network mappings
-            possible_paths = [
-                r"\\bobrick.sharepoint.com\sites\ManufacturingEngineering\Shared Documents",
-                r"\\bobrick.sharepoint.com@SSL\sites\ManufacturingEngineering\Shared Documents",
-                r"\\bobrick-my.sharepoint.com\sites\ManufacturingEngineering\Shared Documents",
-            ]
-            
-            if custom_folder:
-                possible_paths = [os.path.join(path, custom_folder) for path in possible_paths]
-            
-            filename = os.path.basename(file_path)
-            
-            for network_path in possible_paths:
+            for attempt in range(2):
+                network_root = self.find_network_root()
+                if network_root is None:
+                    return False, "Could not access SharePoint via network path"
+                network_path = os.path.join(network_root, custom_folder) if custom_folder else network_root
+                destination = os.path.join(network_path, os.path.basename(file_path))
                 try:
-                    if os.path.exists(network_path):
-                        destination = os.path.join(network_path, filename)
-                        import shutil
-                        shutil.copy2(file_path, destination)
-                        return True, f"File uploaded successfully to: {destination}"
-                except Exception as e:
+                    os.makedirs(network_path, exist_ok=True)
+                    copy_verified(file_path, destination)
+                except OSError:
+                    # The remembered route may have gone stale; probe again once before giving up
+                    self.route_cache.forget()
                     continue
-            
+                return True, f"File uploaded successfully to: {destination}"
             return False, "Could not access SharePoint via network path"
             
         except Exception as e:
             return False, f"Network upload failed: {str(e)}"
     
+    @traced("upload_via_session")
+    def upload_via_session(self, file_path, custom_folder=None, on_progress=None, cancel_event=None):
+        """Upload in resumable chunks through the configured upload-session endpoint. Safe to call off the Tk thread."""
+        if not UPLOAD_ENDPOINT:
+            return False, "No upload endpoint configured"
+        remote_path = "/".join(part for part in (custom_folder, os.path.basename(file_path)) if part)
+        create_url = f"{UPLOAD_ENDPOINT.rstrip('/')}/sessions/{urllib.parse.quote(remote_path)}"
+        try:
+            ChunkedUploader().upload(file_path, create_url, on_progress, cancel_event)
+            return True, f"File uploaded successfully to: {remote_path}"
+        except Exception as e:
+            return False, f"Chunked upload failed: {str(e)}"
+
     def upload_via_browser_automation(self, file_path):
         """Open SharePoint in browser and provide instructions for manual upload."""
         try:
@@ -77,16 +190,22 @@ File location: {file_path}"""
         except Exception as e:
             return False, f"Could not open SharePoint: {str(e)}"
     
-    def upload_file(self, file_path, custom_folder=None):
-        """Upload a file to SharePoint using available methods."""
+    def upload_file(self, file_path, custom_folder=None, on_progress=None):
+        """Uploads through the upload service, then the network path. Returns (success, message).
+
+        Safe to call off the Tk thread; pass the result to finish_upload on the Tk thread.
+        """
         if not os.path.exists(file_path):
-            messagebox.showerror("Error", f"File not found: {file_path}")
-            return False
-        
-        filename = os.path.basename(file_path)
-        
-        # Method 1: Try network path upload
-        success, message = self.upload_via_network_path(file_path, custom_folder)
+            return False, f"File not found: {file_path}"
+
+        # Method 1: Try the upload service, then the network path
+        success, message = self.upload_via_session(file_path, custom_folder, on_progress)
+        if not success:
+            success, message = self.upload_via_network_path(file_path, custom_folder)
+        return success, message
+
+    def finish_upload(self, file_path, success, message):
+        """Reports a network upload result, falling back to manual upload in the browser. Runs on the Tk thread."""
         if success:
             messagebox.showinfo("Upload Successful", message)
             return True
@@ -111,13 +230,16 @@ class SharePointUploadDialog:
         self.file_path = file_path
         self.uploader = SharePointUploader()
         self.result = False
+        self.upload_results = queue.Queue()
+        self.uploading = False  # The worker thread owns the upload until its result is polled
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Upload to SharePoint")
-        self.dialog.geometry("500x400")
+        self.dialog.geometry("500x440")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         self.dialog.resizable(False, False)  # Prevent resizing to maintain layout
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
         self.setup_ui()
         
@@ -152,6 +274,14 @@ class SharePointUploadDialog:
         self.folder_entry = tk.Entry(folder_frame)
         self.folder_entry.pack(fill=tk.X, pady=(5, 0))
         self.folder_entry.insert(0, "VMP-Files")  # Default subfolder
+
+        # Plain .vmp files only reference images on this machine; a bundle carries them along
+        self.bundle_var = tk.BooleanVar(value=not is_bundle(self.file_path))
+        bundle_check = tk.Checkbutton(folder_frame, text="Include images (upload as a single .vmpz bundle)",
+                                      variable=self.bundle_var, font=("Arial", 9))
+        bundle_check.pack(anchor=tk.W, pady=(5, 0))
+        if is_bundle(self.file_path):
+            bundle_check.config(state=tk.DISABLED)
         
         # Instructions
         info_frame = tk.Frame(main_frame)
@@ -161,6 +291,9 @@ class SharePointUploadDialog:
         info_label = tk.Label(info_frame, text=info_text, font=("Arial", 9), 
                              wraplength=400, justify=tk.LEFT, fg='#666666')
         info_label.pack(anchor=tk.W)
+
+        self.status_label = tk.Label(info_frame, text="", font=("Arial", 9, "bold"), fg='#0078d4')
+        self.status_label.pack(anchor=tk.W, pady=(10, 0))
         
         # Buttons - ensure they're always visible
         button_frame = tk.Frame(main_frame)
@@ -170,10 +303,10 @@ class SharePointUploadDialog:
         spacer = tk.Frame(button_frame)
         spacer.pack(side=tk.LEFT, expand=True)
         
-        cancel_btn = tk.Button(button_frame, text="Cancel", command=self.cancel,
+        self.cancel_btn = tk.Button(button_frame, text="Cancel", command=self.cancel,
                               bg='#6c757d', fg='white', font=("Arial", 11, "bold"),
                               padx=25, pady=10, width=12)
-        cancel_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        self.cancel_btn.pack(side=tk.RIGHT, padx=(5, 0))
         
         self.upload_btn = tk.Button(button_frame, text="Upload to SharePoint", command=self.upload_file,
                                    bg='#0078d4', fg='white', font=("Arial", 11, "bold"),
@@ -181,15 +314,65 @@ class SharePointUploadDialog:
         self.upload_btn.pack(side=tk.RIGHT, padx=(0, 10))
         
     def upload_file(self):
-        """Handle file upload."""
+        """Handle file upload; bundling and copying run on a worker thread so the window stays responsive."""
         subfolder = self.folder_entry.get().strip()
-        
-        if self.uploader.upload_file(self.file_path, subfolder if subfolder else None):
+        if not os.path.exists(self.file_path):
+            messagebox.showerror("Error", f"File not found: {self.file_path}", parent=self.dialog)
+            return
+
+        self.uploading = True
+        self.upload_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Preparing upload...")
+        threading.Thread(target=self.run_upload, args=(self.bundle_var.get(), subfolder or None),
+                         name="sharepoint-upload", daemon=True).start()
+        self.dialog.after(50, self.poll_upload)
+
+    def run_upload(self, include_images, subfolder):
+        file_path = self.file_path
+        try:
+            if include_images:
+                file_path = bundle_for_sharing(self.file_path)
+            self.upload_results.put(('status', "Uploading..."))
+            success, message = self.uploader.upload_file(file_path, subfolder, self.report_progress)
+        except Exception as e:
+            success, message = False, f"Failed to prepare upload: {e}"
+        self.upload_results.put(('result', (file_path, success, message)))
+
+    def report_progress(self, sent, total):
+        percent = 100 * sent // total if total else 100
+        self.upload_results.put(('status', f"Uploading... {percent}%"))
+
+    def poll_upload(self):
+        result = None
+        while result is None:
+            try:
+                kind, value = self.upload_results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'status':
+                self.status_label.config(text=value)
+            else:
+                result = value
+        if result is None:
+            self.dialog.after(50, self.poll_upload)
+            return
+
+        file_path, success, message = result
+        self.uploading = False
+
+        self.status_label.config(text="")
+        if self.uploader.finish_upload(file_path, success, message):
             self.result = True
             self.dialog.destroy()
+        else:
+            self.upload_btn.config(state=tk.NORMAL)
+            self.cancel_btn.config(state=tk.NORMAL)
         
     def cancel(self):
-        """Cancel the upload."""
+        """Closes the dialog; ignored while an upload is running, so its result is still reported."""
+        if self.uploading:
+            return
         self.dialog.destroy()
 
 def upload_to_sharepoint(parent, file_path):
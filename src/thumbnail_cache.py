@@ -0,0 +1,123 @@
+"""
+Persistent on-disk cache of gallery thumbnails.
+Thumbnails are keyed by image path and validated against the source file's
+size and modification time, so unchanged images cost one small read instead
+of a full decode. All methods are safe to call from worker threads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from PIL import Image
+
+from . import tracing
+
+THUMBNAIL_SIZE = (150, 150)
+
+def default_cache_dir():
+    return os.path.join(os.getcwd(), ".vmp-cache", "thumbnails")
+
+class ThumbnailCache:
+    """Stores ready-made thumbnails on disk, evicting stale entries automatically."""
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir=None, size=THUMBNAIL_SIZE):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.size = tuple(size)
+        self.index_path = os.path.join(self.cache_dir, self.INDEX_NAME)
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.load_index()
+
+    def load_index(self):
+        """Loads the path -> thumbnail index, starting empty if it is missing or corrupt."""
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('size') == list(self.size):
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Writes the index back to disk if anything changed."""
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = dict(self.entries)
+            self.dirty = False
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'size': list(self.size), 'entries': entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            with self.lock:
+                self.dirty = True
+            raise
+
+    def signature(self, image_path):
+        """Identifies one version of a source image by its size and mtime."""
+        st = os.stat(image_path)
+        return f"{st.st_size}-{st.st_mtime_ns}"
+
+    def get_thumbnail(self, image_path):
+        """Returns a loaded thumbnail for image_path, decoding the source only on a cache miss."""
+        key = os.path.abspath(image_path)
+        signature = self.signature(key)
+
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry['signature'] == signature:
+            try:
+                with Image.open(os.path.join(self.cache_dir, entry['file'])) as cached:
+                    cached.load()
+                    return cached
+            except OSError:
+                pass  # Cache file vanished or is damaged, rebuild it below
+
+        thumbnail = self.render(key)
+        self.store(key, signature, thumbnail)
+        return thumbnail
+
+    def render(self, image_path):
+        """Decodes the source at reduced resolution where possible and scales it down."""
+        tracing.count("images_decoded")
+        with Image.open(image_path) as img:
+            if img.format == 'JPEG':
+                # Let the JPEG decoder skip detail we would throw away anyway (1/2 to 1/8 scale)
+                img.draft('RGB', (self.size[0] * 2, self.size[1] * 2))
+            img.thumbnail(self.size)
+            img.load()
+            if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                img = img.convert('RGBA')
+            return img
+
+    def store(self, key, signature, thumbnail):
+        """Saves a thumbnail and replaces any stale entry for the same path."""
+        filename = hashlib.sha1(key.encode('utf-8')).hexdigest() + ".png"
+        try:
+            thumbnail.save(os.path.join(self.cache_dir, filename), format='PNG')
+        except OSError as e:
+            print(f"Could not cache thumbnail for {key}: {e}")
+            return
+        with self.lock:
+            self.entries[key] = {'signature': signature, 'file': filename}
+            self.dirty = True
+
+    def prune(self, image_paths):
+        """Evicts entries for images that are no longer in the library."""
+        keep = {os.path.abspath(path) for path in image_paths}
+        with self.lock:
+            stale = [(k, self.entries.pop(k)) for k in list(self.entries) if k not in keep]
+            if stale:
+                self.dirty = True
+        for _, entry in stale:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except OSError:
+                pass
@@ -0,0 +1,177 @@
+"""
+Lightweight timing spans and counters, saved as Chrome trace JSON.
+Recording is off by default and costs one flag check per span while off. Set
+VMP_TRACE=1 (or a file path) to record from startup and save the trace when
+the process exits, or turn it on from the app's Tools menu. Open the file in
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import atexit
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+def default_trace_path():
+    name = time.strftime("vmp-trace-%Y%m%d-%H%M%S") + f"-{os.getpid()}.json"
+    return os.path.join(os.getcwd(), ".vmp-cache", "traces", name)
+
+class Span:
+    """Records one complete event when its with-block exits."""
+
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        self.tracer.add_span(self.name, self.start, end, self.args)
+        return False
+
+class NullSpan:
+    """Stands in for a Span while recording is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Tracer:
+    """Collects spans and counters from all threads in Chrome trace event format."""
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.events = []
+        self.counters = {}
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.thread_names = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self.lock:
+            self.events = []
+            self.counters = {}
+            self.thread_names = {}
+
+    def timestamp(self, t):
+        return round((t - self.origin) * 1e6, 1)  # Microseconds
+
+    def note_thread(self, tid):
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+
+    def add_span(self, name, start, end, args=None):
+        tid = threading.get_ident()
+        event = {'name': name, 'ph': 'X', 'ts': self.timestamp(start), 'dur': round((end - start) * 1e6, 1),
+                 'pid': self.pid, 'tid': tid}
+        if args:
+            event['args'] = args
+        with self.lock:
+            self.note_thread(tid)
+            self.events.append(event)
+
+    def span(self, name, **args):
+        """Returns a context manager timing its block as a span called name."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def count(self, name, value=1):
+        """Adds value to a running counter, shown as a graph over time."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        tid = threading.get_ident()
+        with self.lock:
+            self.note_thread(tid)
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.events.append({'name': name, 'ph': 'C', 'ts': self.timestamp(now), 'pid': self.pid, 'tid': tid,
+                                'args': {name: total}})
+
+    def trace_data(self):
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+            thread_names = dict(self.thread_names)
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in thread_names.items()]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms', 'otherData': {'counters': counters}}
+
+    def dump(self, path=None):
+        """Writes the recorded trace as JSON and returns its path."""
+        path = path or default_trace_path()
+        data = self.trace_data()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
+
+def traced(name=None):
+    """Decorator recording each call of the function as a span."""
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(tracer, span_name, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def enable_from_environment():
+    """Starts recording if VMP_TRACE is set, and saves the trace at exit."""
+    setting = os.environ.get("VMP_TRACE", "")
+    if setting.lower() in ("", "0", "false", "no"):
+        return
+    path = None if setting.lower() in ("1", "true", "yes") else setting
+    tracer.enable()
+
+    def save():
+        import multiprocessing
+        if multiprocessing.parent_process() is not None:
+            return  # Batch export workers record too, but only the main process writes the file
+        if tracer.events:
+            print(f"Trace written to {tracer.dump(path)}")
+
+    atexit.register(save)
+
+enable_from_environment()
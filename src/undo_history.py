@@ -0,0 +1,116 @@
+"""
+Undo/redo history for the editor's page list.
+Each step stores only what changed: the old and new values of edited fields,
+or the page dict of an inserted or deleted page. The history has a byte budget
+and forgets its oldest steps first, so memory stays flat over long sessions.
+"""
+
+import json
+from collections import deque
+
+from .page import Page, copy_page_dict, copy_value
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+class UndoStep:
+    """One undoable action: ('set', index, {field: (old, new)}), ('insert', index, page dict) or ('delete', index, page dict)."""
+
+    __slots__ = ('kind', 'index', 'data', 'size')
+
+    def __init__(self, kind, index, data):
+        self.kind = kind
+        self.index = index
+        self.data = data
+        self.size = len(json.dumps(data, separators=(',', ':'))) + 64  # Serialized size plus object overhead
+
+class UndoHistory:
+    """Records page edits as diffs against the page being edited."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.size = 0
+        self.watched_index = None
+        self.baseline = None  # Page dict of the watched page as of the last checkpoint
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps = []
+        self.size = 0
+        self.watched_index = None
+        self.baseline = None
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def watch(self, index, page):
+        """Starts tracking edits to the page shown at index."""
+        self.watched_index = index
+        self.baseline = copy_page_dict(page.to_dict())
+
+    def checkpoint(self, pages):
+        """Records the fields of the watched page that changed since it was last watched or checkpointed."""
+        if self.baseline is None or self.watched_index is None or self.watched_index >= len(pages):
+            return
+        current = pages[self.watched_index].to_dict()
+        changes = {key: (self.baseline.get(key), copy_value(value))
+                   for key, value in current.items() if self.baseline.get(key) != value}
+        if changes:
+            self.push(UndoStep('set', self.watched_index, changes))
+            self.baseline = copy_page_dict(current)
+
+    def record_insert(self, index, page):
+        self.push(UndoStep('insert', index, copy_page_dict(page.to_dict())))
+
+    def record_delete(self, index, page):
+        self.push(UndoStep('delete', index, copy_page_dict(page.to_dict())))
+
+    def push(self, step):
+        self.undo_steps.append(step)
+        self.size += step.size
+        self.size -= sum(s.size for s in self.redo_steps)
+        self.redo_steps = []
+        while self.size > self.max_bytes and len(self.undo_steps) > 1:
+            self.size -= self.undo_steps.popleft().size
+
+    def undo(self, pages, on_insert=None, on_delete=None):
+        """Reverts the newest step in place. Returns the index of the page it touched, or None."""
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.redo_steps.append(step)
+        self.apply(pages, step, reverse=True, on_insert=on_insert, on_delete=on_delete)
+        return min(step.index, len(pages) - 1)
+
+    def redo(self, pages, on_insert=None, on_delete=None):
+        """Re-applies the newest undone step. Returns the index of the page it touched, or None."""
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.undo_steps.append(step)
+        self.apply(pages, step, reverse=False, on_insert=on_insert, on_delete=on_delete)
+        return min(step.index, len(pages) - 1)
+
+    def apply(self, pages, step, reverse, on_insert, on_delete):
+        # The watched page is re-watched by the caller once the change is shown
+        self.baseline = None
+        if step.kind == 'set':
+            page = pages[step.index]
+            for field, (old, new) in step.data.items():
+                value = old if reverse else new
+                setattr(page, field, copy_value(value))
+            return
+        # Undoing an insert deletes the page again, and undoing a delete restores it
+        inserting = (step.kind == 'insert') != reverse
+        if inserting:
+            pages.insert(step.index, Page.from_dict(copy_page_dict(step.data)))
+            if on_insert:
+                on_insert(step.index)
+        else:
+            del pages[step.index]
+            if on_delete:
+                on_delete(step.index)
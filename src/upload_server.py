@@ -0,0 +1,201 @@
+"""
+Local stand-in for the SharePoint upload-session API.
+Speaks the same protocol as chunked_upload.ChunkedUploader and stores finished
+files in a folder. It can inject failures (HTTP 500s, chunks that are only
+partly committed, dropped connections and expired sessions), so resume and
+retry behaviour can be exercised offline:
+
+    python -m src.upload_server --dir received --port 8765 --fail-every 3 --partial-every 4
+
+then set VMP_UPLOAD_ENDPOINT=http://127.0.0.1:8765 before starting the app.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import threading
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+class UploadSession:
+    def __init__(self, name, part_path):
+        self.name = name
+        self.part_path = part_path
+        self.received = 0
+        self.lock = threading.Lock()
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b""
+
+    def session_for_path(self):
+        match = re.fullmatch(r"/upload/([0-9a-f]+)", self.path)
+        return self.server.sessions.get(match.group(1)) if match else None
+
+    def do_POST(self):
+        # POST /sessions/<folder/name> creates an upload session
+        if not self.path.startswith("/sessions/"):
+            self.read_body()
+            return self.send_json(404, {'error': 'not found'})
+        self.read_body()
+        name = urllib.parse.unquote(self.path[len("/sessions/"):]).strip('/')
+        session_id = uuid.uuid4().hex
+        os.makedirs(self.server.parts_dir, exist_ok=True)
+        session = UploadSession(name, os.path.join(self.server.parts_dir, session_id + ".part"))
+        open(session.part_path, 'wb').close()
+        self.server.sessions[session_id] = session
+        host, port = self.server.server_address[:2]
+        self.send_json(200, {'uploadUrl': f"http://{host}:{port}/upload/{session_id}"})
+
+    def do_GET(self):
+        session = self.session_for_path()
+        if session is None:
+            return self.send_json(404, {'error': 'session not found'})
+        with session.lock:
+            self.send_json(200, {'nextExpectedRanges': [f"{session.received}-"]})
+
+    def do_DELETE(self):
+        session = self.session_for_path()
+        if session is None:
+            return self.send_json(404, {'error': 'session not found'})
+        self.server.sessions.pop(os.path.basename(self.path), None)
+        if os.path.exists(session.part_path):
+            os.remove(session.part_path)
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_PUT(self):
+        session = self.session_for_path()
+        body = self.read_body()
+        if session is None:
+            return self.send_json(404, {'error': 'session not found'})
+
+        fault = self.server.next_fault()
+        if fault == 'fail':
+            return self.send_json(500, {'error': 'injected failure'})
+        if fault == 'drop':
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)  # Simulate a connection lost mid-request
+            return
+        if fault == 'expire':
+            self.server.sessions.pop(os.path.basename(self.path), None)
+            return self.send_json(404, {'error': 'session expired'})
+
+        header = self.headers.get('Content-Range', '')
+        match = CONTENT_RANGE.fullmatch(header)
+        if match:
+            start, end, total = (int(value) for value in match.groups())
+        elif header.startswith("bytes */"):
+            start, end, total = 0, -1, int(header[len("bytes */"):])
+        else:
+            return self.send_json(400, {'error': 'missing Content-Range'})
+        if end - start + 1 != len(body):
+            return self.send_json(400, {'error': 'Content-Range does not match body length'})
+
+        with session.lock:
+            if start != session.received:
+                return self.send_json(416, {'nextExpectedRanges': [f"{session.received}-"]})
+            if fault == 'partial' and len(body) > 1:
+                body = body[:len(body) // 2]  # Commit only part of the chunk
+            with open(session.part_path, 'ab') as f:
+                f.write(body)
+            session.received += len(body)
+
+            if session.received < total:
+                return self.send_json(202, {'nextExpectedRanges': [f"{session.received}-"]})
+
+            destination = os.path.join(self.server.root_dir, *session.name.split('/'))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(session.part_path, destination)
+            self.server.sessions.pop(os.path.basename(self.path), None)
+            self.send_json(201, {'name': os.path.basename(destination), 'size': session.received})
+
+class UploadTestServer(ThreadingHTTPServer):
+    """Upload-session server writing finished files under root_dir.
+
+    fail_every, partial_every, drop_every and expire_every inject a fault on
+    every Nth chunk PUT (0 disables that fault).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, root_dir, host="127.0.0.1", port=0, fail_every=0, partial_every=0,
+                 drop_every=0, expire_every=0, verbose=False):
+        super().__init__((host, port), UploadHandler)
+        self.root_dir = root_dir
+        self.parts_dir = os.path.join(root_dir, ".parts")
+        self.sessions = {}
+        self.faults = [('fail', fail_every), ('partial', partial_every), ('drop', drop_every), ('expire', expire_every)]
+        self.put_count = 0
+        self.count_lock = threading.Lock()
+        self.verbose = verbose
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_fault(self):
+        with self.count_lock:
+            self.put_count += 1
+            count = self.put_count
+        for fault, every in self.faults:
+            if every and count % every == 0:
+                return fault
+        return None
+
+    def start(self):
+        """Serves on a background thread; returns self for chaining."""
+        self.thread = threading.Thread(target=self.serve_forever, name="upload-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the SharePoint upload-session API.")
+    parser.add_argument('--dir', default="received", help="folder finished uploads are written to")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-every', type=int, default=0, help="answer every Nth chunk with HTTP 500")
+    parser.add_argument('--partial-every', type=int, default=0, help="commit only half of every Nth chunk")
+    parser.add_argument('--drop-every', type=int, default=0, help="drop the connection on every Nth chunk")
+    parser.add_argument('--expire-every', type=int, default=0, help="expire the session on every Nth chunk")
+    args = parser.parse_args(argv)
+
+    server = UploadTestServer(args.dir, args.host, args.port, args.fail_every, args.partial_every,
+                              args.drop_every, args.expire_every, verbose=True)
+    print(f"Upload test server on {server.url}, writing to {os.path.abspath(args.dir)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
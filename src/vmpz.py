@@ -0,0 +1,213 @@
+"""
+Single-file project bundles (.vmpz).
+A bundle is a zip archive with the project JSON plus every referenced image,
+each stored once under its content hash. Bundles are written in a streaming
+way and read lazily: the project JSON is read on open and images are only
+extracted when they are first needed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from .image_store import hash_file
+from .page import page_dicts
+from .tracing import traced
+
+BUNDLE_EXTENSION = '.vmpz'
+SIGNATURE_SUFFIX = '.sig'  # Next to a shared bundle: which project and image versions it was built from
+PROJECT_MEMBER = 'project.json'
+IMAGE_PREFIX = 'images/'
+IMAGE_FIELDS = ('image_path1', 'image_path2', 'full_image_path')
+# Formats that are already compressed are stored as-is instead of deflated again
+STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_hash_memo = {}  # (path, size, mtime_ns) -> content hash
+
+def is_bundle(path):
+    return bool(path) and path.lower().endswith(BUNDLE_EXTENSION)
+
+def default_extract_root():
+    return os.path.join(os.getcwd(), ".vmp-cache", "vmpz")
+
+def content_hash(path):
+    """Hashes an image, remembering the result while the file is unchanged."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _hash_memo:
+        _hash_memo[key] = hash_file(path)
+    return _hash_memo[key]
+
+def write_bundle(project_data, bundle_path, resolve_image=None):
+    """Writes project_data and its referenced images to bundle_path.
+
+    resolve_image maps an image path to a readable file (used to pull images
+    out of another bundle); missing images are left as broken references.
+    """
+    data = json.loads(json.dumps(project_data))  # Deep copy; image paths get rewritten below
+    members = {}  # member name -> source file
+    for page in data.get('pages', []):
+        for field in IMAGE_FIELDS:
+            image_path = page.get(field)
+            if not image_path:
+                continue
+            source = resolve_image(image_path) if resolve_image else image_path
+            if not source or not os.path.exists(source):
+                continue
+            ext = os.path.splitext(source)[1].lower()
+            member = IMAGE_PREFIX + content_hash(source) + ext
+            members.setdefault(member, source)
+            page[field] = member
+
+    # Build next to the destination and swap in at the end so readers never see a partial bundle
+    bundle_dir = os.path.dirname(os.path.abspath(bundle_path))
+    fd, tmp_path = tempfile.mkstemp(dir=bundle_dir, suffix=BUNDLE_EXTENSION + ".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            # Project JSON goes first so it can be read without touching the images
+            zf.writestr(PROJECT_MEMBER, json.dumps(data, indent=4))
+            for member, source in members.items():
+                compress_type = zipfile.ZIP_STORED if member.endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+                info = zipfile.ZipInfo.from_file(source, member)
+                info.compress_type = compress_type
+                with open(source, 'rb') as src, zf.open(info, 'w', force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, bundle_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return bundle_path
+
+def bundle_project_file(project_file, bundle_path):
+    """Packs a .vmp project file and its images into a .vmpz bundle."""
+    with open(project_file, 'r') as f:
+        project_data = json.load(f)
+    return write_bundle(project_data, bundle_path)
+
+def bundle_signature(project_file, project_data):
+    """Identifies one version of a project and of every image it references, by size and mtime."""
+    st = os.stat(project_file)
+    images = []
+    for page in project_data.get('pages', []):
+        for field in IMAGE_FIELDS:
+            image_path = page.get(field)
+            if not image_path:
+                continue
+            try:
+                image_st = os.stat(image_path)
+                images.append([os.path.abspath(image_path), image_st.st_size, image_st.st_mtime_ns])
+            except OSError:
+                images.append([image_path, None, None])
+    parts = {'project': [os.path.abspath(project_file), st.st_size, st.st_mtime_ns], 'images': images}
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+@traced("bundle_for_sharing")
+def bundle_for_sharing(project_file, bundle_dir=None):
+    """Packs a .vmp project into a bundle under .vmp-cache/bundles and returns its path.
+
+    Bundles are passed through unchanged.
+    """
+    if is_bundle(project_file):
+        return project_file
+    bundle_dir = bundle_dir or os.path.join(os.getcwd(), ".vmp-cache", "bundles")
+    os.makedirs(bundle_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(project_file))[0] + BUNDLE_EXTENSION
+    bundle_path = os.path.join(bundle_dir, name)
+    signature_path = bundle_path + SIGNATURE_SUFFIX
+    with open(project_file, 'r') as f:
+        project_data = json.load(f)
+    signature = bundle_signature(project_file, project_data)
+
+    # Reuse an up-to-date bundle so an interrupted upload of it can resume
+    try:
+        with open(signature_path, 'r') as f:
+            if os.path.exists(bundle_path) and f.read() == signature:
+                return bundle_path
+    except OSError:
+        pass
+    write_bundle(project_data, bundle_path)
+    with open(signature_path, 'w') as f:
+        f.write(signature)
+    return bundle_path
+
+def read_bundle_project(bundle_path):
+    """Reads only the project JSON from a bundle, leaving image paths as member names."""
+    with zipfile.ZipFile(bundle_path) as zf:
+        with zf.open(PROJECT_MEMBER) as f:
+            return json.load(f)
+
+class VmpzBundle:
+    """An open .vmpz bundle whose images are extracted on demand."""
+
+    def __init__(self, bundle_path, extract_root=None):
+        self.bundle_path = os.path.abspath(bundle_path)
+        self.zip = zipfile.ZipFile(self.bundle_path)
+        # Members are content-addressed, so one extraction folder per bundle path never goes stale
+        key = hashlib.sha1(self.bundle_path.encode('utf-8')).hexdigest()
+        self.extract_dir = os.path.join(extract_root or default_extract_root(), key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    def read_project(self):
+        """Returns the project data with image fields pointing at their (lazy) extraction paths."""
+        with self.zip.open(PROJECT_MEMBER) as f:
+            data = json.load(f)
+        for page in data.get('pages', []):
+            for field in IMAGE_FIELDS:
+                member = page.get(field)
+                if member and member.startswith(IMAGE_PREFIX):
+                    page[field] = os.path.join(self.extract_dir, *member.split('/'))
+        return data
+
+    def member_for(self, path):
+        """Returns the archive member an extraction path belongs to, or None."""
+        if not path:
+            return None
+        relative = os.path.relpath(os.path.abspath(path), self.extract_dir)
+        if relative.startswith(os.pardir) or os.path.isabs(relative):
+            return None
+        return relative.replace(os.sep, '/')
+
+    def materialize(self, path):
+        """Makes sure an image from this bundle exists on disk and returns its path."""
+        member = self.member_for(path)
+        if member is None or os.path.exists(path):
+            return path
+        try:
+            info = self.zip.getinfo(member)
+        except KeyError:
+            return path  # Not in the archive; caller shows it as missing
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as dst, self.zip.open(info) as src:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def materialize_pages(self, pages):
+        """Extracts every image referenced by the given pages."""
+        for page_dict in page_dicts(pages):
+            for field in IMAGE_FIELDS:
+                image_path = page_dict.get(field)
+                if image_path:
+                    self.materialize(image_path)
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+import requests
+
+from src import tracing
+from src.chunked_upload import ChunkedUploader, UploadSessionStore
+from src.upload_server import UploadTestServer
+
+CHUNK_SIZE = 64 * 1024
+
+@pytest.fixture
+def server(tmp_path):
+    servers = []
+
+    def start(**faults):
+        srv = UploadTestServer(str(tmp_path / "received"), **faults).start()
+        servers.append(srv)
+        return srv
+
+    yield start
+    for srv in servers:
+        srv.stop()
+
+@pytest.fixture
+def trace():
+    tracing.tracer.clear()
+    tracing.tracer.enable()
+    yield tracing.tracer
+    tracing.tracer.disable()
+    tracing.tracer.clear()
+
+def make_uploader(tmp_path):
+    store = UploadSessionStore(str(tmp_path / "sessions.json"))
+    return ChunkedUploader(http=requests.Session(), chunk_size=CHUNK_SIZE, retry_backoff=0, store=store)
+
+@pytest.mark.parametrize("faults", [
+    {'fail_every': 3},
+    {'partial_every': 2},
+    {'drop_every': 4},
+    {'fail_every': 5, 'partial_every': 3, 'drop_every': 7},
+])
+def test_upload_survives_faults(tmp_path, server, trace, faults):
+    srv = server(**faults)
+    source = tmp_path / "project.vmpz"
+    data = os.urandom(CHUNK_SIZE * 10 + 123)
+    source.write_bytes(data)
+    uploader = make_uploader(tmp_path)
+
+    progress = []
+    uploader.upload(str(source), f"{srv.url}/sessions/VMP-Files/project.vmpz",
+                    on_progress=lambda done, total: progress.append(done))
+
+    assert (tmp_path / "received" / "VMP-Files" / "project.vmpz").read_bytes() == data
+    assert progress[-1] == len(data)
+    assert uploader.store.sessions == {}
+    # Failed, dropped and partly committed chunks only count what the server kept
+    assert trace.counters["upload_bytes_sent"] == len(data)
+
+def test_interrupted_upload_resumes_from_confirmed_offset(tmp_path, server):
+    srv = server()
+    source = tmp_path / "project.vmpz"
+    data = os.urandom(CHUNK_SIZE * 6)
+    source.write_bytes(data)
+    create_url = f"{srv.url}/sessions/project.vmpz"
+
+    class Stop(Exception):
+        pass
+
+    def stop_halfway(done, total):
+        if done >= CHUNK_SIZE * 3:
+            raise Stop()
+
+    with pytest.raises(Stop):
+        make_uploader(tmp_path).upload(str(source), create_url, on_progress=stop_halfway)
+
+    # A new uploader (as after a restart) picks up the remembered session
+    offsets = []
+    make_uploader(tmp_path).upload(str(source), create_url, on_progress=lambda done, total: offsets.append(done))
+    assert offsets[0] == CHUNK_SIZE * 3
+    assert (tmp_path / "received" / "project.vmpz").read_bytes() == data
@@ -0,0 +1,79 @@
+import datetime
+import glob
+import os
+
+import pytest
+
+from src import pdf_export, tracing
+from src.image_derivatives import DerivativeCache
+from src.page import load_project_pages
+from src.pdf_page_cache import PageRenderCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_PROJECTS = sorted(glob.glob(os.path.join(REPO_ROOT, "VMP-Projects", "*.vmp")))
+SAMPLE_IMAGES = sorted(glob.glob(os.path.join(REPO_ROOT, "VMP-Images", "*.png")))
+IMAGE_FIELDS = ('image_path1', 'image_path2', 'full_image_path')
+CREATION_DATE = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+def with_sample_images(pages, offset=0):
+    """Points every image a page uses at a real file under VMP-Images; the samples carry paths from another machine."""
+    n = offset
+    for page in pages:
+        for field in IMAGE_FIELDS:
+            if getattr(page, field):
+                setattr(page, field, SAMPLE_IMAGES[n % len(SAMPLE_IMAGES)])
+                n += 1
+    return pages
+
+def image_count(pages):
+    return sum(1 for page in pages for field in IMAGE_FIELDS if getattr(page, field))
+
+def build_bytes(pages, use_cache):
+    pdf = pdf_export.build_pdf(pages, pdf_export.DEFAULT_EXPORT_DPI, use_cache=use_cache)
+    pdf.set_creation_date(CREATION_DATE)
+    return bytes(pdf.output())
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(pdf_export, "_derivative_cache", DerivativeCache(str(tmp_path / "derivatives")))
+    cache = PageRenderCache(str(tmp_path / "pages"))
+    monkeypatch.setattr(pdf_export, "_page_cache", cache)
+    return cache
+
+@pytest.fixture
+def trace():
+    tracing.tracer.clear()
+    tracing.tracer.enable()
+    yield tracing.tracer
+    tracing.tracer.disable()
+    tracing.tracer.clear()
+
+@pytest.mark.skipif(len(SAMPLE_PROJECTS) < 2, reason="needs sample projects")
+def test_cached_build_matches_uncached_after_other_projects(caches):
+    # One cache shared by every project, so each is replayed after pages of the others were cached
+    for project_file in SAMPLE_PROJECTS + SAMPLE_PROJECTS:
+        pages = with_sample_images(load_project_pages(project_file))
+        assert build_bytes(pages, use_cache=True) == build_bytes(pages, use_cache=False), project_file
+
+@pytest.mark.skipif(not SAMPLE_PROJECTS or len(SAMPLE_IMAGES) < 2, reason="needs sample projects and images")
+def test_replayed_pages_renumber_images(caches, trace):
+    # Cached pages are replayed in a different order, so each page's images get different indices in the new PDF
+    pages = [page for project_file in SAMPLE_PROJECTS for page in load_project_pages(project_file)]
+    pages = with_sample_images(pages)
+    assert image_count(pages) > len(SAMPLE_IMAGES)
+    build_bytes(pages, use_cache=True)
+    trace.clear()
+    reordered = pages[::-1]
+    assert build_bytes(reordered, use_cache=True) == build_bytes(reordered, use_cache=False)
+    # Only standard pages print their number, so the moved full-image pages must have come from the cache
+    moved_image_pages = [page for page in pages if page.page_type != 'standard' and image_count([page])]
+    assert moved_image_pages
+    assert trace.counters.get("pdf_page_cache_hits", 0) >= len(moved_image_pages)
+
+@pytest.mark.skipif(not SAMPLE_PROJECTS, reason="needs sample projects")
+def test_prune_keeps_cache_under_budget(caches):
+    build_bytes(load_project_pages(SAMPLE_PROJECTS[0]), use_cache=True)
+    caches.max_bytes = 0
+    caches.prune()
+    assert not [name for name in os.listdir(caches.cache_dir) if name.endswith(".bin")]
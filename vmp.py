@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Command line entry point for the Visual Manufacturing Procedures tool.
+Provides headless operations that do not need the Tk editor, e.g.
+
+    python vmp.py export VMP-Projects --jobs 4
+    python vmp.py export "VMP-Projects/vmp*.vmp" --output-dir exports
+    python vmp.py sync --dest //server/share/VMP-Files
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+def cmd_export(args):
+    """Exports projects to PDF on a process pool."""
+    from src.batch_export import find_projects, find_pdf_collisions, run_batch_export, format_summary
+
+    project_files = find_projects(args.targets)
+    if not project_files:
+        print("No .vmp or .vmpz projects found.", file=sys.stderr)
+        return 1
+
+    collisions = find_pdf_collisions(project_files, args.output_dir)
+    if collisions:
+        for pdf_path, paths in sorted(collisions.items()):
+            print(f"These projects would all be exported to {pdf_path}:", file=sys.stderr)
+            for path in paths:
+                print(f"  {path}", file=sys.stderr)
+        print("Export them to separate output directories or rename them.", file=sys.stderr)
+        return 1
+
+    jobs = args.jobs if args.jobs and args.jobs > 0 else None
+    print(f"Exporting {len(project_files)} project(s) with {jobs or os.cpu_count()} worker(s)...")
+
+    def on_result(result):
+        status = "ok" if result.ok else "FAILED"
+        print(f"  [{status}] {os.path.basename(result.project_file)} ({result.seconds:.2f}s)", flush=True)
+
+    start = time.perf_counter()
+    results = run_batch_export(project_files, output_dir=args.output_dir, jobs=jobs, on_result=on_result,
+                               target_dpi=args.dpi or None)
+    print()
+    print(format_summary(results, time.perf_counter() - start))
+    return 0 if all(r.ok for r in results) else 1
+
+def cmd_sync(args):
+    """Copies new and changed projects, images and PDFs between this folder and the shared one."""
+    from src.project_sync import ProjectSync, format_sync_summary
+
+    destination = args.dest
+    if destination is None:
+        from src.sharepoint_uploader import SharePointUploader
+        network_root = SharePointUploader().find_network_root()
+        if network_root is None:
+            print("Could not access SharePoint via network path; pass --dest.", file=sys.stderr)
+            return 1
+        destination = os.path.join(network_root, "VMP-Files")
+
+    print(f"Syncing {os.path.abspath(args.root)} with {destination}{' (dry run)' if args.dry_run else ''}...")
+
+    def on_action(action, rel_path, error):
+        status = "ok" if error is None else "FAILED"
+        print(f"  [{status}] {action} {rel_path}", flush=True)
+
+    sync = ProjectSync(args.root, destination)
+    result = sync.run(push=not args.pull_only, pull=not args.push_only, propagate_deletes=args.delete,
+                      dry_run=args.dry_run, on_action=on_action)
+    print()
+    print(format_sync_summary(result))
+    return 0 if result.ok else 1
+
+def build_parser():
+    from src.pdf_export import DEFAULT_EXPORT_DPI
+
+    parser = argparse.ArgumentParser(prog="vmp", description="Visual Manufacturing Procedures tool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export projects to PDF without the editor")
+    export_parser.add_argument("targets", nargs="+",
+                               help="Project directories, .vmp/.vmpz files or glob patterns")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None,
+                               help="Number of worker processes, 0 for one per CPU (default: CPU count)")
+    export_parser.add_argument("-o", "--output-dir", default=None,
+                               help="Write PDFs here instead of next to each project")
+    export_parser.add_argument("--dpi", type=int, default=DEFAULT_EXPORT_DPI,
+                               help=f"Downsample images to this resolution at their placed size, "
+                                    f"0 embeds originals (default: {DEFAULT_EXPORT_DPI})")
+    export_parser.set_defaults(func=cmd_export)
+
+    sync_parser = subparsers.add_parser("sync", help="Copy only new or changed files to and from a shared folder")
+    sync_parser.add_argument("--dest", default=None,
+                             help="Shared folder to sync with (default: VMP-Files on the SharePoint network path)")
+    sync_parser.add_argument("--root", default=".",
+                             help="Folder holding VMP-Projects and VMP-Images (default: current folder)")
+    direction = sync_parser.add_mutually_exclusive_group()
+    direction.add_argument("--push-only", action="store_true", help="Only copy local changes to the shared folder")
+    direction.add_argument("--pull-only", action="store_true", help="Only copy shared changes to this folder")
+    sync_parser.add_argument("--delete", action="store_true",
+                             help="Also delete files that were deleted on the other side since the last sync")
+    sync_parser.add_argument("-n", "--dry-run", action="store_true", help="Show what would be copied")
+    sync_parser.set_defaults(func=cmd_sync)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())